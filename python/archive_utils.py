@@ -2,6 +2,7 @@ import os
 import zipfile
 import rarfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from shutil import make_archive, which
 
 def _has_unrar():
@@ -9,14 +10,58 @@ def _has_unrar():
     candidates = ["unrar", "unrar.exe", "winrar", "winrar.exe", "bsdtar"]
     return any(which(cmd) is not None for cmd in candidates)
 
+def _resolve_target(extract_to, name):
+    """Resolve an archive member path inside extract_to, or None if it escapes.
+
+    Writing members directly bypasses extractall's path sanitization, so
+    it has to be replicated here: a hostile archive can carry "../" or
+    absolute member names that would land outside the extraction root
+    (zip-slip). Such entries are skipped.
+    """
+    target = os.path.realpath(os.path.join(extract_to, name))
+    root = os.path.realpath(extract_to)
+    if target == root or target.startswith(root + os.sep):
+        return target
+    return None
+
+def _extract_member(zf, info, extract_to):
+    """Extract one zip entry straight to disk with a large copy buffer."""
+    target = _resolve_target(extract_to, info.filename)
+    if target is None:
+        return
+    if info.file_size == 0:
+        open(target, "wb").close()
+        return
+    with zf.open(info) as src, open(target, "wb") as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+
+def _make_dirs_for(infos, extract_to):
+    """Create every target directory once, before extraction starts."""
+    dirs = {os.path.dirname(info.filename) for info in infos}
+    dirs.update(info.filename for info in infos if info.is_dir())
+    for d in sorted(d for d in dirs if d):
+        target = _resolve_target(extract_to, d)
+        if target is not None:
+            os.makedirs(target, exist_ok=True)
+
 def extract_archive(input_path, extract_to):
     """Extracts .zip or .rar archive to a target folder."""
     os.makedirs(extract_to, exist_ok=True)
     lower = input_path.lower()
 
     if lower.endswith(".zip"):
-        with zipfile.ZipFile(input_path, "r") as zf:
-            zf.extractall(extract_to)
+        # Large explicit buffer on the archive handle: zipfile's seek+read
+        # pattern otherwise issues many small syscalls.
+        with open(input_path, "rb", buffering=1 << 20) as fh, zipfile.ZipFile(fh) as zf:
+            infos = zf.infolist()
+            _make_dirs_for(infos, extract_to)
+            files = [info for info in infos if not info.is_dir()]
+            if files:
+                # Subtitle packs are thousands of small entries; extracting
+                # them concurrently overlaps decompression with file I/O.
+                workers = min(len(files), os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    list(executor.map(lambda info: _extract_member(zf, info, extract_to), files))
     elif lower.endswith(".rar"):
         if not _has_unrar():
             raise RuntimeError("WinRAR or unrar not found on PATH.")
@@ -25,6 +70,17 @@ def extract_archive(input_path, extract_to):
     else:
         raise RuntimeError("Unsupported file format. Use .zip or .rar")
 
+def extract_archives(paths, extract_to_root, workers=None):
+    """Extracts several archives concurrently, one subfolder per archive."""
+    if not paths:
+        return
+    def _extract_one(path):
+        name, _ = os.path.splitext(os.path.basename(path))
+        extract_archive(path, os.path.join(extract_to_root, name))
+    workers = workers or min(len(paths), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(_extract_one, paths))
+
 def make_zip(folder_path, output_zip_path):
     """Zips a folder into a .zip file."""
     os.makedirs(os.path.dirname(output_zip_path), exist_ok=True)
@@ -4,10 +4,21 @@
 Comprehensive error handling and recovery system for subtitle translation
 """
 
+import atexit
 import json
 import os
+import re
+from collections import Counter
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+
+try:
+    import orjson
+    def _json_line(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    def _json_line(obj) -> str:
+        return json.dumps(obj)
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
@@ -31,7 +42,7 @@ class ErrorType(Enum):
     AUTHENTICATION_ERROR = "authentication_error"
     UNKNOWN_ERROR = "unknown_error"
 
-@dataclass
+@dataclass(slots=True)
 class ErrorRecord:
     """Represents a single error event"""
     error_type: str
@@ -50,7 +61,20 @@ class ErrorRecord:
             self.timestamp = datetime.now().isoformat()
     
     def to_dict(self):
-        return asdict(self)
+        # Flat record: building the dict directly skips dataclasses.asdict's
+        # recursive introspection and deep copy on every log write
+        return {
+            'error_type': self.error_type,
+            'severity': self.severity,
+            'filename': self.filename,
+            'language': self.language,
+            'message': self.message,
+            'details': self.details,
+            'timestamp': self.timestamp,
+            'recoverable': self.recoverable,
+            'retry_count': self.retry_count,
+            'max_retries': self.max_retries,
+        }
     
     def is_retryable(self) -> bool:
         """Check if this error can be retried"""
@@ -64,10 +88,16 @@ class ErrorRecord:
 class ErrorLogger:
     """Centralized error logging and tracking"""
     
-    def __init__(self, log_file: Optional[str] = None):
+    def __init__(self, log_file: Optional[str] = None, flush_every: int = 64):
         self.errors: List[ErrorRecord] = []
         self.log_file = log_file or "translation_errors.log"
-        self.failed_files: Dict[str, List[ErrorRecord]] = {}
+        self.failed_files: Dict[Tuple[str, Optional[str]], List[ErrorRecord]] = {}
+        self._counts_by_type: Counter = Counter()
+        self._counts_by_severity: Counter = Counter()
+        self.flush_every = flush_every
+        self._fh = None
+        self._pending_writes = 0
+        atexit.register(self.close)
     
     def log_error(
         self,
@@ -91,12 +121,12 @@ class ErrorLogger:
         )
         
         self.errors.append(error)
-        
-        # Track failed files
-        key = f"{filename}_{language}" if language else filename
-        if key not in self.failed_files:
-            self.failed_files[key] = []
-        self.failed_files[key].append(error)
+
+        # Track failed files with a real (filename, language) tuple key -
+        # string keys were lossy for filenames containing '_'
+        self.failed_files.setdefault((filename, language), []).append(error)
+        self._counts_by_type[error_type] += 1
+        self._counts_by_severity[severity] += 1
         
         # Write to file
         self._write_to_log_file(error)
@@ -106,20 +136,42 @@ class ErrorLogger:
     def _write_to_log_file(self, error: ErrorRecord):
         """Write error to log file"""
         try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(error.to_dict()) + '\n')
+            if self._fh is None:
+                # Persistent buffered handle: one open() for the whole run
+                # instead of open/close per error event
+                self._fh = open(self.log_file, 'a', encoding='utf-8', buffering=1 << 16)
+            self._fh.write(_json_line(error.to_dict()) + '\n')
+            self._pending_writes += 1
+            if self._pending_writes >= self.flush_every:
+                self.flush()
         except Exception as e:
             print(f"Failed to write error log: {e}")
+
+    def flush(self):
+        """Flush buffered log writes to disk"""
+        if self._fh is not None:
+            try:
+                self._fh.flush()
+            except Exception as e:
+                print(f"Failed to flush error log: {e}")
+        self._pending_writes = 0
+
+    def close(self):
+        """Flush and close the log file handle"""
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except Exception:
+                pass
+            self._fh = None
+        self._pending_writes = 0
     
-    def get_failed_files(self) -> List[Tuple[str, str, int]]:
+    def get_failed_files(self) -> List[Tuple[str, Optional[str], int]]:
         """Get list of failed files with language and error count"""
-        failed = []
-        for key, errors in self.failed_files.items():
-            parts = key.split('_')
-            filename = parts[0]
-            lang = '_'.join(parts[1:]) if len(parts) > 1 else None
-            failed.append((filename, lang, len(errors)))
-        return failed
+        return [
+            (filename, language, len(errors))
+            for (filename, language), errors in self.failed_files.items()
+        ]
     
     def get_retryable_failures(self) -> List[Dict]:
         """Get list of failures that can be retried"""
@@ -147,21 +199,16 @@ class ErrorLogger:
     
     def _count_by_type(self) -> Dict[str, int]:
         """Count errors by type"""
-        counts = {}
-        for error in self.errors:
-            counts[error.error_type] = counts.get(error.error_type, 0) + 1
-        return counts
-    
+        return dict(self._counts_by_type)
+
     def _count_by_severity(self) -> Dict[str, int]:
         """Count errors by severity"""
-        counts = {}
-        for error in self.errors:
-            counts[error.severity] = counts.get(error.severity, 0) + 1
-        return counts
+        return dict(self._counts_by_severity)
     
     def clear_log(self):
         """Clear error log file"""
         try:
+            self.close()
             if os.path.exists(self.log_file):
                 os.remove(self.log_file)
         except Exception as e:
@@ -175,21 +222,19 @@ class ErrorLogger:
         except Exception as e:
             print(f"Failed to export errors: {e}")
 
+# Retryable: rate limits, timeouts, temporary failures
+_RETRYABLE_RE = re.compile(
+    r"rate limit|timeout|temporarily|connection|overloaded|429|503|502|unavailable",
+    re.IGNORECASE,
+)
+
 class ErrorRecovery:
     """Error recovery and retry strategies"""
-    
+
     @staticmethod
     def should_retry_api_error(error: Exception) -> bool:
         """Determine if API error is retryable"""
-        error_str = str(error).lower()
-        
-        # Retryable: rate limits, timeouts, temporary failures
-        retryable_keywords = [
-            'rate limit', 'timeout', 'temporarily', 'connection',
-            'overloaded', '429', '503', '502', 'unavailable'
-        ]
-        
-        return any(keyword in error_str for keyword in retryable_keywords)
+        return _RETRYABLE_RE.search(str(error)) is not None
     
     @staticmethod
     def get_retry_delay(retry_count: int) -> float:
@@ -1,24 +1,58 @@
-import re
-
 def parse_srt(content):
-    """Parse SRT content into structured blocks."""
-    pattern = re.compile(r"(\d+)\s+(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})\s+(.*?)\s*(?=\n\d+\n|\Z)", re.S)
-    matches = pattern.findall(content)
+    """Parse SRT content into structured blocks.
+
+    Linear single-pass parser: blocks are separated by blank lines, so one
+    split plus per-block line handling stays O(n) even on very large files
+    (the previous lookahead regex re-scanned the content while backtracking).
+    Malformed blocks are skipped, matching the old regex behavior.
+    """
+    content = content.replace("\r\n", "\n").replace("\r", "\n")
 
     blocks = []
-    for m in matches:
+    for raw in content.strip().split("\n\n"):
+        lines = raw.strip().split("\n")
+        if len(lines) < 2:
+            continue
+
+        index = lines[0].strip()
+        if not index.isdigit():
+            continue
+
+        timing = lines[1]
+        if timing.find(" --> ") == -1:
+            continue
+        start, end = timing.split(" --> ", 1)
+
         blocks.append({
-            "index": m[0],
-            "start": m[1],
-            "end": m[2],
-            "lines": [line.strip() for line in m[3].split("\n") if line.strip()]
+            "index": index,
+            "start": start.strip(),
+            "end": end.strip(),
+            "lines": [s for line in lines[2:] if (s := line.strip())]
         })
     return blocks
 
 def rebuild_srt(blocks):
-    """Rebuild structured SRT blocks into text."""
-    parts = []
-    for b in blocks:
-        lines = "\n".join(b["lines"])
-        parts.append(f"{b['index']}\n{b['start']} --> {b['end']}\n{lines}\n")
-    return "\n".join(parts)
+    """Rebuild structured SRT blocks into text.
+
+    A single join over a flat generator of components avoids allocating an
+    intermediate string per block.
+    """
+    def _parts():
+        first = True
+        for b in blocks:
+            if not first:
+                yield "\n"
+            first = False
+            yield b["index"]
+            yield "\n"
+            yield b["start"]
+            yield " --> "
+            yield b["end"]
+            yield "\n"
+            if b["lines"]:
+                for line in b["lines"]:
+                    yield line
+                    yield "\n"
+            else:
+                yield "\n"
+    return "".join(_parts())
@@ -255,6 +255,141 @@ Target 2
     test.report()
     return test
 
+def _import_translator():
+    """Import translator, stubbing the OpenAI client stack if it's absent.
+
+    The helpers under test (_parse_batch_response, _pack_batches) are pure
+    string/list functions; they should stay testable on machines without
+    the API dependencies installed.
+    """
+    try:
+        import translator
+        return translator
+    except ImportError:
+        import types
+        openai = types.ModuleType('openai')
+        for name in ('OpenAI', 'AsyncOpenAI'):
+            setattr(openai, name, type(name, (), {}))
+        for name in ('RateLimitError', 'APIError', 'APITimeoutError',
+                     'OpenAIError', 'AuthenticationError', 'BadRequestError'):
+            setattr(openai, name, type(name, (Exception,), {}))
+        sys.modules.setdefault('openai', openai)
+        httpx = types.ModuleType('httpx')
+        sys.modules.setdefault('httpx', httpx)
+        dotenv = types.ModuleType('dotenv')
+        dotenv.load_dotenv = lambda *args, **kwargs: None
+        sys.modules.setdefault('dotenv', dotenv)
+        import translator
+        return translator
+
+def test_batch_response_parsing():
+    """Test %%-separated batch response parsing"""
+    test = TestScenario("Batch Response Parsing", "Verify %% separator parsing, trailing separators and label fallback")
+    try:
+        translator = _import_translator()
+        parse = translator._parse_batch_response
+
+        # Exact segment count
+        if parse("uno\n%%\ndos\n%%\ntres", 3) != ["uno", "dos", "tres"]:
+            raise Exception("Exact-count response parsed incorrectly")
+
+        # Trailing separator (the streaming cutoff guarantees one)
+        if parse("uno\n%%\ndos\n%%\ntres\n%%", 3) != ["uno", "dos", "tres"]:
+            raise Exception("Trailing separator not dropped")
+
+        # Cutoff mid-way through a hallucinated extra segment
+        if parse("uno\n%%\ndos\n%%\ntres\n%%\nextra", 3) != ["uno", "dos", "tres"]:
+            raise Exception("Partial extra segment not discarded")
+
+        # Legacy [L#] label fallback
+        if parse("[L1] uno\n[L2] dos\n[L3] tres", 3) != ["uno", "dos", "tres"]:
+            raise Exception("Label fallback parsed incorrectly")
+
+        # Short response leaves the missing slots blank for the refill pass
+        if parse("uno\n%%\ndos", 3) != ["", "", ""]:
+            raise Exception("Unparseable response should leave blanks")
+
+        test.passed = True
+    except Exception as e:
+        test.add_error(f"Batch response parsing test failed: {e}")
+    test.report()
+    return test
+
+def test_batch_packing():
+    """Test greedy batch packing boundaries"""
+    test = TestScenario("Batch Packing", "Verify _pack_batches respects char and item budgets")
+    try:
+        translator = _import_translator()
+        pack = translator._pack_batches
+        max_chars = translator.MAX_BATCH_CHARS
+        max_items = translator.MAX_BATCH_ITEMS
+
+        if pack([]) != []:
+            raise Exception("Empty input should pack to no batches")
+
+        # Item cap: short lines split on MAX_BATCH_ITEMS boundaries
+        lines = [f"line {i}" for i in range(max_items + 5)]
+        batches = pack(lines)
+        if [len(b) for b in batches] != [max_items, 5]:
+            raise Exception(f"Item cap not respected: {[len(b) for b in batches]}")
+
+        # Char cap: long lines split before the budget is exceeded
+        long_lines = ["x" * 1000] * 7
+        batches = pack(long_lines)
+        for batch in batches:
+            if len(batch) > 1 and sum(len(t) for t in batch) > max_chars:
+                raise Exception("Char budget exceeded within a batch")
+
+        # A single over-budget line still gets its own batch
+        if pack(["y" * (max_chars + 100)]) != [["y" * (max_chars + 100)]]:
+            raise Exception("Oversized single line mishandled")
+
+        # Order is preserved across batches
+        if [t for b in pack(lines) for t in b] != lines:
+            raise Exception("Packing reordered lines")
+
+        test.passed = True
+    except Exception as e:
+        test.add_error(f"Batch packing test failed: {e}")
+    test.report()
+    return test
+
+def test_cli_parsing():
+    """Test the hand-rolled bridge CLI parser"""
+    test = TestScenario("CLI Parsing", "Verify _parse_cli handles switches, multi-value flags and missing flags")
+    try:
+        from translator_bridge import _parse_cli
+
+        cmd, args = _parse_cli([
+            'translate', '--source', '/s', '--output', '/o',
+            '--langs', 'Hindi', 'Thai', '--model', 'gpt-4o-mini',
+            '--api-key', 'sk-test', '--parallel-langs', '--batch',
+        ])
+        if cmd != 'translate':
+            raise Exception(f"Wrong command: {cmd}")
+        if args.get('langs') != ['Hindi', 'Thai']:
+            raise Exception(f"Multi-value --langs parsed incorrectly: {args.get('langs')}")
+        if args.get('parallel_langs') is not True or args.get('batch') is not True:
+            raise Exception("Switch flags not set")
+        if args.get('parallel_files'):
+            raise Exception("Unset switch should be absent")
+        if args.get('api_key') != 'sk-test':
+            raise Exception("Hyphenated flag not normalized to api_key")
+
+        # Missing flag stays absent so main() reports it and exits
+        cmd, args = _parse_cli(['analyze', '--model', 'gpt-4o-mini'])
+        if 'source' in args:
+            raise Exception("Missing flag should not appear in args")
+
+        if _parse_cli([]) != (None, {}):
+            raise Exception("Empty argv should yield no command")
+
+        test.passed = True
+    except Exception as e:
+        test.add_error(f"CLI parsing test failed: {e}")
+    test.report()
+    return test
+
 def test_json_serialization():
     """Test JSON serialization of error data"""
     test = TestScenario("JSON Serialization", "Verify error data can be JSON serialized")
@@ -297,6 +432,9 @@ def run_all_tests():
         test_srt_file_parsing(),
         test_file_operations_error_handling(),
         test_validation_with_mismatched_blocks(),
+        test_batch_response_parsing(),
+        test_batch_packing(),
+        test_cli_parsing(),
         test_json_serialization()
     ]
     
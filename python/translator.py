@@ -1,12 +1,49 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import asyncio
+import atexit
+import functools
+import hashlib
+import json
+import logging
 import os
+import queue
+import re
+import sqlite3
+import threading
 import time
 import random
-from openai import OpenAI, RateLimitError, APIError, APITimeoutError, OpenAIError
+from logging.handlers import QueueHandler, QueueListener
+import httpx
+from openai import (
+    OpenAI, AsyncOpenAI, RateLimitError, APIError, APITimeoutError, OpenAIError,
+    AuthenticationError, BadRequestError,
+)
 from dotenv import load_dotenv
-from tqdm import tqdm
+
+# ---------------------------
+# Logging (queued so workers never block on stderr I/O)
+# ---------------------------
+logger = logging.getLogger("translator")
+
+def _setup_logging():
+    """Route log records through a queue to a background listener.
+
+    Synchronous print() flushes serialized the concurrent workers on the
+    stderr write lock; with a QueueHandler the hot path just enqueues."""
+    if logger.handlers:
+        return
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = QueueListener(log_queue, handler)
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    listener.start()
+    atexit.register(listener.stop)
+
+_setup_logging()
 
 # ---------------------------
 # Model ID Mapping (Frontend → OpenAI)
@@ -30,307 +67,20 @@ def get_actual_model_id(frontend_model_id: str) -> str:
 # Style presets per language
 # ---------------------------
 
-LANG_STYLE_PRESETS = {
-    "hinglish": """
-Translate into natural Hinglish that matches the tone of Japanese dramas - emotionally nuanced, sincere, and appropriate to context.
-
-🎭 Tone Adaptation (Match the Japanese drama mood):
-- Detect the scene's emotional weight and mirror it:
-  • Romantic/Tender → warm, heartfelt: "Mujhe tumse bahut zyada matlab hai." / "I really care about you, sach mein."
-  • Emotional/Serious → restrained yet expressive: "Main samajh sakta hoon tumhara dard." / "Tumne jo kiya, uska mujh par asar hua."
-  • Angry/Confrontational → direct but not overly aggressive: "Tum yeh kaise kar sakte ho?" / "Explain karo mujhe, abhi."
-  • Playful/Light → gentle teasing, not over-the-top: "Acha? Toh tumhe lagta hai main impressed ho jaungi?" 
-  • Polite/Formal (workplace/seniors) → respectful mix: "Ji, main samajh gaya." / "Aap sahi keh rahe hain."
-  • Melancholic/Reflective → thoughtful, measured: "Kabhi kabhi sochta hoon... kya sab theek ho payega?"
-
-🧠 Gender & Context Awareness:
-- Adjust based on clear speaker context:
-  • Male → "karunga", "tha", "mujhe laga", "main gaya"
-  • Female → "karungi", "thi", "mujhe lagi", "main gayi"
-- If gender is unclear, use neutral constructions or lean slightly formal.
-- Never force gender assumptions from names alone.
-
-💬 Dialogue Style Guidelines:
-- Natural Hindi-English blend: "Main kal office nahi aaunga." / "Tumhe pata hai na, yeh important hai?"
-- Use conversational fillers sparingly: "yaar", "na", "toh", "acha", "haan", "matlab"
-- Keep the Japanese drama's measured pacing - don't make it too chatty or rushed
-- Preserve emotional subtext - Japanese dramas often say much with few words
-- Common expressions:
-  • "Theek hai" (okay/fine)
-  • "Samajh gaya/gayi" (I understand)
-  • "Kya hua?" (What happened?)
-  • "Sach mein?" (Really?)
-  • "Mujhe pata hai" (I know)
-
-📝 Translation Philosophy:
-- Don't translate names, places, honorifics (San, Kun, Sama, Sensei, Senpai - keep these)
-- Maintain the original's emotional intensity - neither inflate nor deflate
-- Keep lines concise and subtitle-friendly
-- If the Japanese is formal, reflect that; if casual, match it naturally
-
-Reference vibe: Think measured emotional delivery like "Terrace House", "Hana Yori Dango", or thoughtful Bollywood dramas, not loud comedy shows.
-""",
-
-    "taglish": """
-Translate into natural Taglish that respects the tone and emotional depth of Japanese dramas.
-
-🎬 Core Translation Philosophy:
-- Japanese dramas are nuanced and sincere - match that emotional authenticity
-- Use 50-60% English + 40-50% Tagalog, but let the scene's mood guide the balance
-- More formal scenes → slightly more Tagalog structure
-- Casual scenes → more natural Taglish flow
-- Keep it real and heartfelt, never forced or overly trendy
-
-🎭 Tone Adaptation:
-- Romantic/Tender → gentle, sincere: "Na-miss kita, totoo." / "You mean so much to me, alam mo yun?"
-- Emotional/Serious → measured, heartfelt: "Hindi ko alam kung kaya ko pa." / "I understand what you're going through."
-- Sad/Melancholic → understated but felt: "Ang hirap, eh. Pero kaya natin 'to." / "Masakit, but I'll be okay."
-- Angry/Frustrated → controlled intensity: "Bakit mo ginawa yun?" / "You think I don't know? Alam ko lahat."
-- Playful/Light → natural teasing: "Talaga ba? Parang hindi nga." / "You're funny, you know that?"
-- Polite/Formal → respectful blend: "Naiintindihan ko po." / "Salamat for understanding."
-
-💬 Dialogue Examples by Context:
-- Confession: "Gusto kita, okay? Like, more than a friend."
-- Apology: "Sorry talaga. Hindi ko intention na saktan ka."
-- Comfort: "Nandito lang ako, always. You're not alone."
-- Conflict: "Bakit mo sinabi yun? You hurt me, alam mo ba?"
-- Reflection: "Minsan, I wonder... if things could have been different."
-
-🧠 Natural Word Blending:
-- Common Taglish patterns:
-  • "Gusto ko lang na..." (I just want to...)
-  • "Hindi ko sure kung..." (I'm not sure if...)
-  • "Parang ang weird, di ba?" (It feels weird, right?)
-  • "Seryoso ka?" (Are you serious?)
-- Keep borrowed English words: date, office, breakup, feelings, sorry, love
-- Conversational fillers: "like", "actually", "kasi", "eh", "naman", "diba", "no"
-
-🎌 Japanese Drama Considerations:
-- Keep honorifics (San, Kun, Sama, Sensei) as-is
-- Maintain the emotional restraint when present
-- Don't oversimplify complex emotional moments
-- Preserve the weight of significant lines
-
-📏 Technical Rules:
-- Never translate names or places
-- Avoid overly deep/formal Tagalog words unless the original is very formal
-- Keep each subtitle line short and readable
-- Match the number of output lines to input exactly
-
-🎞️ Reference Vibe:
-Think emotional authenticity of "Can't Buy Me Love", "He's Into Her" but with the measured sincerity of Japanese dramas like "Hana Kimi" or "Mischievous Kiss".
-""",
-
-    "vietnamese": """
-Dịch sang tiếng Việt tự nhiên phù hợp với phong cách phim truyền hình Nhật Bản - chân thực về cảm xúc và phù hợp với ngữ cảnh.
-
-🎭 Điều Chỉnh Giọng Điệu (Theo tâm trạng của phim Nhật):
-- Lãng mạn/Dịu dàng → ấm áp, chân thành: "Anh thực sự quan tâm đến em." / "Em có ý nghĩa rất nhiều với anh."
-- Cảm xúc/Nghiêm túc → kiềm chế nhưng sâu sắc: "Anh hiểu nỗi đau của em." / "Anh biết em đang cảm thấy thế nào."
-- Buồn/U sầu → giản dị nhưng đầy cảm xúc: "Đau lắm... nhưng em sẽ ổn thôi." / "Thật khó khăn, nhưng mình sẽ vượt qua."
-- Tức giận/Đối đầu → trực tiếp nhưng có chừng mực: "Sao anh lại làm thế?" / "Em cần anh giải thích cho em hiểu."
-- Vui tươi/Nhẹ nhàng → tự nhiên, tinh nghịch nhẹ: "Thật sao? Em nghĩ anh sẽ ấn tượng à?" / "Anh thật đáng yêu đấy."
-- Lịch sự/Trang trọng → tôn trọng: "Tôi hiểu rồi ạ." / "Cảm ơn anh đã thông cảm."
-- Trầm tư/Suy ngẫm → chu đáo, chậm rãi: "Đôi khi em tự hỏi... liệu mọi thứ có thể khác đi không?"
-
-🧠 Nhận Thức Giới Tính & Ngữ Cảnh:
-- Nam: "tôi/anh/mình" + "sẽ làm", "đã đi", "nghĩ rằng"
-- Nữ: "tôi/em/mình" + "sẽ làm", "đã đi", "nghĩ rằng"
-- Sử dụng đại từ phù hợp với mối quan hệ:
-  • Bạn bè thân → "tao/mày" hoặc "tôi/cậu"
-  • Lịch sự → "tôi/bạn" hoặc "anh/em"
-  • Trang trọng → "tôi/anh/chị"
-
-💬 Phong Cách Hội Thoại:
-- Giữ nguyên tên người, địa danh, danh hiệu (San, Kun, Sama, Sensei, Senpai)
-- Dùng từ tự nhiên: "ừ", "à", "nhỉ", "nhé", "đấy", "mà"
-- Các cụm thường dùng:
-  • "Được rồi" (okay)
-  • "Em/Anh hiểu rồi" (I understand)
-  • "Chuyện gì vậy?" (What happened?)
-  • "Thật sao?" (Really?)
-  • "Em/Anh biết mà" (I know)
-- Tránh dùng từ ngữ quá văn chương hoặc quá thô tục
-- Giữ nhịp độ điều độ như trong phim Nhật - không vội vàng
-
-📝 Nguyên Tắc Dịch:
-- Giữ nguyên độ sâu cảm xúc - không phóng đại cũng không giảm nhẹ
-- Câu ngắn gọn, dễ đọc trên phụ đề
-- Phản ánh mức độ trang trọng của bản gốc
-- Tinh tế trong diễn đạt cảm xúc - phim Nhật thường nói ít nhưng ý nhiều
-
-🎌 Tham Khảo:
-Phong cách chân thực, cảm xúc tinh tế như các bộ phim "Hana Yori Dango", "Good Morning Call", hoặc "Itazura na Kiss".
-""",
-
-    "thai": """
-แปลเป็นภาษาไทยธรรมชาติที่เหมาะกับโทนของละครญี่ปุ่น - มีอารมณ์ที่ละเอียดอ่อนและเหมาะสมกับบริบท
-
-🎭 การปรับโทนเสียง (ให้เข้ากับอารมณ์ของละครญี่ปุ่น):
-- โรแมนติก/อ่อนโยน → อบอุ่น จริงใจ: "ฉันใส่ใจเธอมากนะ" / "เธอมีความหมายกับฉันมาก"
-- อารมณ์เข้มข้น/จริงจัง → ยับยั้งแต่แสดงออก: "ฉันเข้าใจความเจ็บปวดของเธอ" / "สิ่งที่เธอทำมันส่งผลกับฉันมาก"
-- เศร้า/หดหู่ → เรียบง่ายแต่เต็มไปด้วยอารมณ์: "มันเจ็บนะ... แต่ฉันจะโอเคเอง" / "ยากจริงๆ แต่เราจะผ่านมันไปได้"
-- โกรธ/เผชิญหน้า → ตรงไปตรงมาแต่มีขอบเขต: "ทำไมเธอถึงทำแบบนี้?" / "ฉันต้องการให้เธออธิบาย"
-- สนุกสนาน/เบาสบาย → แกล้งกันแบบอ่อนๆ: "จริงเหรอ? นึกว่าฉันจะประทับใจเนี่ยนะ" / "เธอน่ารักจังเลย"
-- สุภาพ/เป็นทางการ → เคารพ: "ผม/ดิฉันเข้าใจแล้วค่ะ/ครับ" / "ขอบคุณที่เข้าใจนะคะ/ครับ"
-- ไตร่ตรอง/ครุ่นคิด → ใคร่ครวญ รอบคอบ: "บางทีก็นึกว่า... ทุกอย่างจะดีขึ้นได้ไหมนะ?"
-
-🧠 การรับรู้เพศและบริบท:
-- ชาย: "ผม", "ครับ", กริยาปกติ
-- หญิง: "ดิฉัน/ฉัน", "ค่ะ/คะ", กริยาปกติ
-- เพื่อนสนิท/ไม่เป็นทางการ: "กู/มึง", "เรา/เธอ"
-- ปกติ/กึ่งทางการ: "ฉัน/เธอ", "ฉัน/คุณ"
-- ถ้าไม่แน่ใจเพศ ใช้รูปแบบกลางๆ
-
-💬 แนวทางการสนทนา:
-- เก็บชื่อคน สถานที่ คำนำหน้า (San, Kun, Sama, Sensei, Senpai) ไว้ตามเดิม
-- คำที่ใช้บ่อย: "นะ", "ล่ะ", "เหรอ", "สิ", "หรอก", "เนอะ"
-- วลีทั่วไป:
-  • "โอเคแล้ว" (okay)
-  • "เข้าใจแล้ว" (I understand)
-  • "เกิดอะไรขึ้น?" (What happened?)
-  • "จริงเหรอ?" (Really?)
-  • "ฉัน/ผมรู้" (I know)
-- หลีกเลี่ยงภาษาที่เป็นทางการเกินไปหรือหยาบคายเกินไป
-- รักษาจังหวะที่สมดุลเหมือนในละครญี่ปุ่น - ไม่รีบร้อน
-
-📝 หลักการแปล:
-- รักษาความเข้มข้นทางอารมณ์เดิม - ไม่ขยายหรือลดทอน
-- ประโยคสั้น กระชับ อ่านง่ายบนซับไตเติล
-- สะท้อนระดับความเป็นทางการของต้นฉบับ
-- ละเอียดอ่อนในการแสดงอารมณ์ - ละครญี่ปุ่นมักพูดน้อยแต่หมายความมาก
-
-🎌 อ้างอิง:
-สไตล์ที่จริงใจและอารมณ์ละเอียดอ่อนเหมือนละครญี่ปุ่นอย่าง "Hana Yori Dango", "Good Morning Call" หรือ "Itazura na Kiss"
-""",
-
-    "malay": """
-Terjemahkan ke Bahasa Melayu semula jadi yang sesuai dengan nada drama Jepun - bernuansa emosi dan sesuai konteks.
-
-🎭 Penyesuaian Nada (Ikut suasana drama Jepun):
-- Romantis/Lembut → mesra, ikhlas: "Awak sangat bermakna pada saya." / "Saya betul-betul ambil berat tentang awak."
-- Emosi/Serius → terkawal tetapi ekspresif: "Saya faham perasaan awak." / "Apa yang awak buat, ia memberi kesan pada saya."
-- Sedih/Sendu → ringkas tetapi penuh perasaan: "Sakit... tapi saya akan okay." / "Memang susah, tapi kita boleh hadapi."
-- Marah/Konfrontasi → terus terang tetapi terkawal: "Kenapa awak buat macam ni?" / "Saya nak awak jelaskan sekarang."
-- Main-main/Ringan → sedikit usikan: "Betul ke? Awak ingat saya akan terkesan?" / "Awak ni comel lah."
-- Sopan/Formal → hormat: "Saya faham." / "Terima kasih kerana memahami."
-- Merenung/Reflektif → berfikir, berhati-hati: "Kadang-kadang saya tertanya... bolehkah semuanya jadi lebih baik?"
-
-🧠 Kesedaran Jantina & Konteks:
-- Lelaki: "saya", nada neutral atau sedikit tegas
-- Perempuan: "saya", nada lembut atau ekspresif
-- Rakan rapat: "aku/kau", "kita/awak"
-- Biasa/formal: "saya/awak", "saya/anda"
-- Jika tidak pasti jantina, guna konstruksi neutral
-
-💬 Panduan Dialog:
-- Kekalkan nama, tempat, gelaran (San, Kun, Sama, Sensei, Senpai) seperti asal
-- Kata-kata biasa: "lah", "kan", "ke", "ya", "pun"
-- Frasa lazim:
-  • "Okay" / "Baiklah"
-  • "Saya faham" (I understand)
-  • "Apa jadi?" (What happened?)
-  • "Betul ke?" (Really?)
-  • "Saya tahu" (I know)
-- Elakkan bahasa terlalu formal atau terlalu kasar
-- Kekalkan rentak yang seimbang seperti drama Jepun - tidak terburu-buru
-
-📝 Falsafah Terjemahan:
-- Kekalkan keamatan emosi asal - jangan tambah atau kurangkan
-- Ayat pendek, mudah dibaca pada sarikata
-- Cerminkan tahap formaliti asal
-- Halus dalam menyampaikan emosi - drama Jepun sering berkata sedikit tetapi bermakna banyak
-
-🎌 Rujukan:
-Gaya yang tulen dan emosi halus seperti drama Jepun "Hana Yori Dango", "Good Morning Call", atau "Itazura na Kiss".
-""",
-
-    "spanish": """
-Traduce al español natural que se ajuste al tono de los dramas japoneses - emocionalmente matizado, sincero y apropiado al contexto.
-
-🎭 Adaptación de Tono (Siguiendo el estado de ánimo del drama japonés):
-- Romántico/Tierno → cálido, sincero: "Me importas mucho de verdad." / "Significas tanto para mí."
-- Emocional/Serio → contenido pero expresivo: "Entiendo tu dolor." / "Lo que hiciste me afectó mucho."
-- Triste/Melancólico → sencillo pero sentido: "Duele... pero estaré bien." / "Es difícil, pero lo superaremos."
-- Enojado/Confrontacional → directo pero medido: "¿Por qué hiciste eso?" / "Necesito que me expliques ahora."
-- Juguetón/Ligero → bromista suave: "¿En serio? ¿Pensaste que me impresionarías?" / "Eres adorable, ¿sabes?"
-- Cortés/Formal → respetuoso: "Entiendo." / "Gracias por comprender."
-- Reflexivo/Pensativo → contemplativo, medido: "A veces me pregunto... ¿podrían las cosas haber sido diferentes?"
-
-🧠 Conciencia de Género y Contexto:
-- Masculino: terminaciones -o (cansado, preocupado)
-- Femenino: terminaciones -a (cansada, preocupada)
-- Si no está claro, usar construcciones neutras
-- Ajustar el nivel de formalidad según la relación:
-  • Amigos cercanos: "tú", tono casual
-  • Formal/respeto: "usted", tono respetuoso
-  • Normal: "tú" con respeto apropiado
-
-💬 Guía de Diálogo:
-- Mantener nombres, lugares, títulos honoríficos (San, Kun, Sama, Sensei, Senpai) sin traducir
-- Palabras comunes: "bueno", "pues", "¿no?", "¿verdad?", "eh"
-- Frases típicas:
-  • "Está bien" / "Vale" (okay)
-  • "Entiendo" (I understand)
-  • "¿Qué pasó?" (What happened?)
-  • "¿En serio?" (Really?)
-  • "Lo sé" (I know)
-- Evitar lenguaje demasiado formal o demasiado coloquial
-- Mantener el ritmo medido como en los dramas japoneses - sin prisas
-
-📝 Filosofía de Traducción:
-- Preservar la intensidad emocional original - no exagerar ni minimizar
-- Frases cortas, fáciles de leer en subtítulos
-- Reflejar el nivel de formalidad del original
-- Ser sutil en la expresión emocional - los dramas japoneses dicen mucho con pocas palabras
-
-🎌 Referencia:
-Estilo auténtico y emocionalmente sutil como en dramas japoneses tipo "Hana Yori Dango", "Good Morning Call", o "Itazura na Kiss".
-""",
-
-    "indonesian": """
-Terjemahkan ke Bahasa Indonesia natural yang sesuai dengan nada drama Jepang - bernuansa emosi, tulus, dan sesuai konteks.
-
-🎭 Penyesuaian Nada (Ikuti suasana drama Jepang):
-- Romantis/Lembut → hangat, tulus: "Aku beneran peduli sama kamu." / "Kamu berarti banget buat aku."
-- Emosional/Serius → terkendali tapi ekspresif: "Aku ngerti perasaanmu." / "Yang kamu lakukan, itu ngaruh banget ke aku."
-- Sedih/Melankolis → sederhana tapi terasa: "Sakit sih... tapi aku bakal baik-baik aja." / "Susah, tapi kita bisa lewatin ini."
-- Marah/Konfrontasi → langsung tapi tetap terkontrol: "Kenapa kamu lakuin itu?" / "Aku butuh kamu jelasin sekarang."
-- Main-main/Ringan → goda lembut: "Serius? Kamu pikir aku bakal terkesan?" / "Kamu lucu, tau nggak?"
-- Sopan/Formal → hormat: "Saya mengerti." / "Terima kasih atas pengertiannya."
-- Reflektif/Merenung → penuh pemikiran, terukur: "Kadang aku mikir... apa semua bisa jadi lebih baik ya?"
-
-🧠 Kesadaran Gender & Konteks:
-- Laki-laki: "gue/aku", "bro" (untuk teman), nada netral atau tegas
-- Perempuan: "aku/saya", nada lembut atau ekspresif
-- Teman dekat: "gue/lo", "aku/kamu"
-- Normal: "aku/kamu"
-- Formal: "saya/Anda"
-- Kalau gender nggak jelas, pakai konstruksi netral
-
-💬 Panduan Dialog:
-- Jangan terjemahkan nama, tempat, gelar kehormatan (San, Kun, Sama, Sensei, Senpai)
-- Kata-kata umum: "sih", "deh", "dong", "kan", "kok", "ya"
-- Frasa lazim:
-  • "Oke" / "Baiklah"
-  • "Aku ngerti" (I understand)
-  • "Ada apa?" / "Kenapa?" (What happened?)
-  • "Serius?" (Really?)
-  • "Aku tau kok" (I know)
-- Campur kata bahasa Inggris modern: "sorry", "meeting", "deadline", "feeling"
-- Hindari bahasa terlalu formal atau terlalu kasar
-- Jaga ritme yang seimbang seperti drama Jepang - nggak terburu-buru
-
-📝 Filosofi Terjemahan:
-- Pertahankan intensitas emosi asli - jangan dilebih-lebihkan atau dikurangi
-- Kalimat pendek, mudah dibaca di subtitle
-- Cerminkan tingkat formalitas aslinya
-- Halus dalam menyampaikan emosi - drama Jepang sering bilang sedikit tapi artinya banyak
-
-🎌 Referensi:
-Gaya yang autentik dan emosi yang halus seperti drama Jepang "Hana Yori Dango", "Good Morning Call", atau "Itazura na Kiss". Bukan gaya keras atau lebay seperti sinetron Indonesia.
-""",
-}
+_STYLES_DIR = os.path.join(os.path.dirname(__file__), "styles")
+
+@functools.lru_cache(maxsize=16)
+def _load_preset(key: str):
+    """Load a style preset from styles/<key>.md, or None if absent.
+
+    The presets are ~20 KB of multi-byte text; loading them on demand keeps
+    import time and per-worker memory down when only one language is used.
+    """
+    try:
+        with open(os.path.join(_STYLES_DIR, f"{key}.md"), encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
 
 
 # ---------------------------
@@ -339,6 +89,8 @@ Gaya yang autentik dan emosi yang halus seperti drama Jepang "Hana Yori Dango",
 load_dotenv()
 _client = None
 _client_api_key = None
+_aclient = None
+_aclient_api_key = None
 
 def get_client(api_key: str | None = None) -> OpenAI:
     """Return a cached OpenAI client initialized with the current API key."""
@@ -346,6 +98,10 @@ def get_client(api_key: str | None = None) -> OpenAI:
 
     key = api_key or os.getenv("OPENAI_API_KEY")
     if not key:
+        # Callers that primed the client with an explicit key earlier
+        # (the bridge does) keep using it without an env variable
+        if _client is not None:
+            return _client
         raise OpenAIError(
             "The api_key client option must be set either by passing api_key to the client or by setting the OPENAI_API_KEY environment variable"
         )
@@ -356,6 +112,34 @@ def get_client(api_key: str | None = None) -> OpenAI:
 
     return _client
 
+def get_async_client(api_key: str | None = None) -> AsyncOpenAI:
+    """Return a cached AsyncOpenAI client initialized with the current API key."""
+    global _aclient, _aclient_api_key
+
+    key = api_key or os.getenv("OPENAI_API_KEY")
+    if not key:
+        if _aclient is not None:
+            return _aclient
+        raise OpenAIError(
+            "The api_key client option must be set either by passing api_key to the client or by setting the OPENAI_API_KEY environment variable"
+        )
+
+    if _aclient is None or _aclient_api_key != key:
+        # HTTP/2 multiplexes the concurrent batch requests over a few
+        # keep-alive connections; the widened pool stops the default
+        # transport from tearing down and re-handshaking TLS under load.
+        _aclient = AsyncOpenAI(
+            api_key=key,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(120.0, connect=10.0),
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=100),
+            ),
+        )
+        _aclient_api_key = key
+
+    return _aclient
+
 # ---------------------------
 # Pricing table (USD per 1M tokens as of Jan 2025)
 # Converted to per-token pricing for calculation
@@ -411,6 +195,47 @@ MODEL_PRICES = {
 }
 
 
+# ---------------------------
+# Rate limits (per-key tier; keep below the account's RPM/TPM ceiling)
+# ---------------------------
+MAX_REQUESTS_PER_MINUTE = 500
+MAX_TOKENS_PER_MINUTE = 200_000
+
+class AsyncTokenBucket:
+    """Token bucket that refills continuously at rate_per_minute / 60.
+
+    Gating concurrent requests on this keeps throughput at the tier limit
+    instead of blasting past it and paying for 429 backoff storms.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self.tokens = float(rate_per_minute)
+        self.fill_rate = rate_per_minute / 60.0
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1.0):
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.fill_rate
+            await asyncio.sleep(wait)
+
+def _estimate_request_tokens(request_kwargs) -> int:
+    """Token estimate for a chat request: exact input count plus an output
+    allowance (translations come back at roughly input length)."""
+    model = request_kwargs["model"]
+    prompt_tokens = sum(
+        count_tokens(m["content"], model) for m in request_kwargs["messages"]
+    )
+    return prompt_tokens * 2
+
 # ---------------------------
 # System prompt template
 # ---------------------------
@@ -459,52 +284,82 @@ Language-Specific Style Guide:
 # ---------------------------
 # Cost estimation
 # ---------------------------
-def estimate_cost(total_tokens, model):
-    """Estimate approximate cost for given model and token count."""
+@functools.lru_cache(maxsize=8)
+def _encoder_for(model: str):
+    """Return the tiktoken encoder for a model, cached per model.
+
+    encoding_for_model loads a multi-megabyte BPE table; caching keeps
+    that to one load per model for the whole run. The import is lazy so
+    merely importing this module doesn't pay for the Rust extension.
+    """
+    import tiktoken
+    try:
+        return tiktoken.encoding_for_model(get_actual_model_id(model))
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+def count_tokens(text: str, model: str) -> int:
+    """Count the exact tokens a piece of text costs for a model."""
+    return len(_encoder_for(model).encode(text))
+
+def estimate_cost(prompt_tokens, completion_tokens, model):
+    """Cost in (USD, INR) from a real input/output token breakdown.
+
+    Translation runs skew roughly 70/30 input/output, so the old
+    total/2 split consistently misreported cost; callers now pass the
+    prompt and completion counts separately (from response.usage or
+    count_tokens).
+    """
     if model not in MODEL_PRICES:
         raise ValueError(f"Unknown model '{model}'.")
-    in_toks = out_toks = total_tokens / 2
     m = MODEL_PRICES[model]
-    usd = (in_toks * m["input"]) + (out_toks * m["output"])
+    usd = (prompt_tokens * m["input"]) + (completion_tokens * m["output"])
     inr = usd * 83
     return usd, inr
 
 # ---------------------------
 # Style picker
 # ---------------------------
+# Map variations to standard keys
+_LANG_KEY_MAP = {
+    "hinglish": "hinglish",
+    "hindi": "hinglish",
+    "taglish": "taglish",
+    "tagalog": "taglish",
+    "filipino": "taglish",
+    "philippines": "taglish",
+    "vietnamese": "vietnamese",
+    "vietnam": "vietnamese",
+    "viet": "vietnamese",
+    "thai": "thai",
+    "thailand": "thai",
+    "malay": "malay",
+    "malaysian": "malay",
+    "malaysia": "malay",
+    "bahasa melayu": "malay",
+    "spanish": "spanish",
+    "español": "spanish",
+    "castilian": "spanish",
+    "indonesian": "indonesian",
+    "indonesia": "indonesian",
+    "bahasa": "indonesian",
+}
+
+# One alternation scan instead of a substring check per alias; alternation
+# order follows the map so longer/more specific aliases keep priority
+_LANG_PATTERN = re.compile("|".join(re.escape(p) for p in _LANG_KEY_MAP))
+
+@functools.lru_cache(maxsize=32)
 def get_style_for_lang(lang: str) -> str:
     """Return stylistic instructions for the requested language."""
     key = lang.strip().lower()
-    
-    # Map variations to standard keys
-    lang_map = {
-        "hinglish": "hinglish",
-        "hindi": "hinglish",
-        "taglish": "taglish",
-        "tagalog": "taglish",
-        "filipino": "taglish",
-        "philippines": "taglish",
-        "vietnamese": "vietnamese",
-        "vietnam": "vietnamese",
-        "viet": "vietnamese",
-        "thai": "thai",
-        "thailand": "thai",
-        "malay": "malay",
-        "malaysian": "malay",
-        "malaysia": "malay",
-        "bahasa melayu": "malay",
-        "spanish": "spanish",
-        "español": "spanish",
-        "castilian": "spanish",
-        "indonesian": "indonesian",
-        "indonesia": "indonesian",
-        "bahasa": "indonesian",
-    }
-    
-    for pattern, standard_key in lang_map.items():
-        if pattern in key:
-            return LANG_STYLE_PRESETS.get(standard_key, _fallback_style(lang))
-    
+
+    m = _LANG_PATTERN.search(key)
+    if m:
+        preset = _load_preset(_LANG_KEY_MAP[m.group(0)])
+        if preset is not None:
+            return preset
+
     # If no match found, return fallback
     return _fallback_style(lang)
 
@@ -526,71 +381,112 @@ Guidelines:
 # ---------------------------
 # Safe API call with retry/backoff
 # ---------------------------
+def _retry_delay(e, prev_sleep):
+    """Delay before the next retry attempt.
+
+    A server-provided Retry-After header wins; otherwise use capped
+    decorrelated jitter, which keeps concurrent workers from retrying in
+    lockstep the way plain 2**attempt backoff does.
+    """
+    response = getattr(e, "response", None)
+    headers = getattr(response, "headers", None) if response is not None else None
+    if headers is not None:
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                return min(60.0, float(retry_after))
+            except ValueError:
+                pass
+    return min(60.0, random.uniform(1.0, prev_sleep * 3))
+
 def safe_api_call(func, *args, **kwargs):
     max_retries = 5
+    prev_sleep = 1.0
     for attempt in range(max_retries):
         try:
             return func(*args, **kwargs)
+        except (AuthenticationError, BadRequestError):
+            # Unrecoverable - retrying a bad key or malformed request just
+            # burns the backoff budget
+            raise
         except (RateLimitError, APIError, APITimeoutError) as e:
-            wait_time = min(30, 2 ** attempt + random.uniform(0, 2))
-            print(f"⚠️ API error: {str(e)}. Retrying in {wait_time:.1f}s...")
+            wait_time = _retry_delay(e, prev_sleep)
+            prev_sleep = wait_time
+            logger.warning("API error: %s. Retrying in %.1fs...", e, wait_time)
             time.sleep(wait_time)
         except Exception as e:
-            print(f"❌ Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
+            raise
+    raise RuntimeError("API call failed after multiple retries.")
+
+async def safe_api_call_async(func, *args, **kwargs):
+    max_retries = 5
+    prev_sleep = 1.0
+    for attempt in range(max_retries):
+        try:
+            return await func(*args, **kwargs)
+        except (AuthenticationError, BadRequestError):
+            raise
+        except (RateLimitError, APIError, APITimeoutError) as e:
+            wait_time = _retry_delay(e, prev_sleep)
+            prev_sleep = wait_time
+            logger.warning("API error: %s. Retrying in %.1fs...", e, wait_time)
+            await asyncio.sleep(wait_time)
+        except Exception as e:
+            logger.error("Unexpected error: %s", e)
             raise
     raise RuntimeError("API call failed after multiple retries.")
 
 # ---------------------------
 # Helper: does this model allow custom temperature?
 # ---------------------------
+# Some newer models (like gpt-5-mini / gpt-5) reject custom temperature;
+# 4o-class models accept it. Precomputed so the per-request check is a
+# single hash lookup instead of a lowercase + substring scan.
 def _model_supports_temperature(model_name: str) -> bool:
-    """
-    Some newer models (like gpt-5-mini / gpt-5) reject custom temperature.
-    Older / 4o-class models accept temperature.
-    We'll use a simple heuristic.
-    """
-    # Get the actual model ID being used
-    actual_model = get_actual_model_id(model_name)
-    lowered = actual_model.lower()
-    if "gpt-5" in lowered:
-        return False
-    # we assume gpt-4o-mini and similar support temperature
-    return True
+    """Whether this model accepts a custom temperature parameter."""
+    # Substring test on the resolved id: dated or unmapped gpt-5 ids have
+    # to match too, so a fixed set of frontend pricing keys isn't enough.
+    return "gpt-5" not in get_actual_model_id(model_name)
 
 # ---------------------------
 # Translate a batch of lines
 # ---------------------------
-def translate_batch(lines, lang, model):
-    """
-    lines: list[str]
-      each element is one subtitle block's dialogue text
-    returns: list[str] same length, translated 1:1
+@functools.lru_cache(maxsize=32)
+def _build_system_prompt(lang: str) -> str:
+    """Format the system prompt once per language.
+
+    Re-formatting the ~4 KB template per batch wastes CPU, and a
+    byte-identical system message also lets OpenAI's server-side prompt
+    caching fire across requests.
     """
+    return BASE_SYSTEM_PROMPT.format(
+        lang_label=lang,
+        style_block=get_style_for_lang(lang).strip()
+    )
 
+def _build_batch_request(lines, lang, model):
+    """Build the chat-completion kwargs for one batch of subtitle lines."""
     # Map frontend model ID to actual OpenAI model ID
     actual_model = get_actual_model_id(model)
 
-    style_block = get_style_for_lang(lang)
-    sys_prompt = BASE_SYSTEM_PROMPT.format(
-        lang_label=lang,
-        style_block=style_block.strip()
-    )
-
-    # Tag each input line with [L1], [L2], ...
-    numbered_lines = []
-    for idx, text in enumerate(lines):
-        numbered_lines.append(f"[L{idx+1}] {text}")
+    sys_prompt = _build_system_prompt(lang)
 
+    # Separate lines with a bare %% line instead of [L1]-style labels:
+    # the separator costs one token per line on input and output, while
+    # labels cost 4-5 (and output tokens are the expensive ones).
     user_prompt = (
-        "You will receive several subtitle lines in English.\n"
+        "You will receive several subtitle lines in English, separated by a "
+        "line containing exactly %%.\n"
         "For EACH line:\n"
         "- Translate it separately into the requested style.\n"
-        "- KEEP the same label, like [L1], [L2], etc.\n"
         "- Do NOT merge multiple source lines into one.\n"
         "- Do NOT skip any line.\n"
-        "- Output MUST contain all labels in order.\n\n"
+        "- Output ONLY the translations, in the same order, separated by a "
+        "line containing exactly %%.\n"
+        "- Output MUST contain the same number of segments as the input.\n\n"
         "Lines:\n" +
-        "\n".join(numbered_lines)
+        "\n%%\n".join(lines)
     )
 
     request_kwargs = {
@@ -603,6 +499,65 @@ def translate_batch(lines, lang, model):
     if _model_supports_temperature(model):
         request_kwargs["temperature"] = 0.3
 
+    return request_kwargs
+
+# A separator line: %% alone on its own line (surrounding whitespace allowed)
+SEPARATOR_RE = re.compile(r"^\s*%%\s*$", re.MULTILINE)
+
+# Matches one labeled segment, e.g. "[L2] translated text"; the lookahead
+# lets a segment span lines until the next label (or end of output)
+LABEL_RE = re.compile(r"^\[L(\d+)\]\s*(.*?)(?=\n\[L\d+\]|\Z)", re.MULTILINE | re.DOTALL)
+
+def _parse_batch_response(raw, count):
+    """Split the %%-separated output back into the original order.
+
+    Falls back to the legacy [L#] label parser when the segment count
+    doesn't line up, since small models occasionally drop separators.
+    """
+    parts = [p.strip() for p in SEPARATOR_RE.split(raw)]
+    if len(parts) == count + 1:
+        # A trailing separator leaves one extra segment: the streaming
+        # cutoff guarantees the text ends with %%, and models often append
+        # one anyway. Drop an empty tail, or the partial segment the cutoff
+        # truncated - falling through to the label parser would blank the
+        # whole batch, since it can never match %% output.
+        if not parts[-1] or all(parts[:count]):
+            return parts[:count]
+    if len(parts) == count:
+        return parts
+    return _parse_labeled_response(raw, count)
+
+def _parse_labeled_response(raw, count):
+    """Legacy parser for [L#]-labeled output.
+
+    One finditer sweep instead of a per-line Python loop; segments that
+    wrap across lines stay attached to their label instead of becoming
+    silent blanks that force a retry.
+    """
+    translated_lines = [""] * count
+    for m in LABEL_RE.finditer(raw):
+        out_index = int(m.group(1)) - 1
+        if 0 <= out_index < count:
+            translated_lines[out_index] = m.group(2).strip()
+
+    return translated_lines
+
+# How many times a partially-parsed batch may re-request just its
+# missing lines before giving up on them
+MAX_REFILL_DEPTH = 2
+
+def _missing_slots(translated_lines):
+    """Indexes the parser left empty."""
+    return [i for i, t in enumerate(translated_lines) if not t]
+
+def translate_batch(lines, lang, model, _depth=0):
+    """
+    lines: list[str]
+      each element is one subtitle block's dialogue text
+    returns: list[str] same length, translated 1:1
+    """
+    request_kwargs = _build_batch_request(lines, lang, model)
+
     client = get_client()
     response = safe_api_call(
         client.chat.completions.create,
@@ -610,24 +565,72 @@ def translate_batch(lines, lang, model):
     )
 
     raw = response.choices[0].message.content.strip()
+    translated_lines = _parse_batch_response(raw, len(lines))
 
-    # Parse the labeled output back into the original order
-    translated_lines = [""] * len(lines)
-    for line in raw.split("\n"):
-        line = line.strip()
-        if not line:
-            continue
-        if line.startswith("[L"):
-            close_bracket = line.find("]")
-            if close_bracket != -1:
-                label = line[2:close_bracket]  # e.g. L2 -> '2'
-                try:
-                    out_index = int(label) - 1
-                    text_after = line[close_bracket+1:].strip()
-                    if 0 <= out_index < len(translated_lines):
-                        translated_lines[out_index] = text_after
-                except ValueError:
-                    pass
+    # Re-request only the lines the model dropped: retrying the whole
+    # batch for one missing slot wastes tokens proportional to its size.
+    missing = _missing_slots(translated_lines)
+    if missing and _depth < MAX_REFILL_DEPTH:
+        refill = translate_batch([lines[i] for i in missing], lang, model,
+                                 _depth=_depth + 1)
+        for i, translated in zip(missing, refill):
+            translated_lines[i] = translated
+
+    return translated_lines
+
+async def translate_batch_async(lines, lang, model, semaphore=None,
+                                rpm_bucket=None, tpm_bucket=None, _depth=0):
+    """Async variant of translate_batch, optionally gated by a semaphore
+    and request/token rate buckets."""
+    request_kwargs = _build_batch_request(lines, lang, model)
+
+    aclient = get_async_client()
+    count = len(lines)
+
+    async def _call():
+        if rpm_bucket is not None:
+            await rpm_bucket.acquire(1)
+        if tpm_bucket is not None:
+            await tpm_bucket.acquire(_estimate_request_tokens(request_kwargs))
+
+        # Stream the completion so we can stop paying for output tokens the
+        # moment the model runs past the expected segment count
+        stream = await safe_api_call_async(
+            aclient.chat.completions.create,
+            stream=True,
+            **request_kwargs
+        )
+        text = ""
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            text += delta
+            # count segments need count-1 separators; one more means the
+            # model is hallucinating extra lines - cut the stream
+            if text.count("\n%%") >= count:
+                await stream.close()
+                break
+        return text
+
+    if semaphore is not None:
+        async with semaphore:
+            raw = await _call()
+    else:
+        raw = await _call()
+
+    translated_lines = _parse_batch_response(raw.strip(), count)
+
+    # Re-request only the lines the model dropped (see translate_batch)
+    missing = _missing_slots(translated_lines)
+    if missing and _depth < MAX_REFILL_DEPTH:
+        refill = await translate_batch_async(
+            [lines[i] for i in missing], lang, model,
+            semaphore, rpm_bucket, tpm_bucket, _depth=_depth + 1)
+        for i, translated in zip(missing, refill):
+            translated_lines[i] = translated
 
     return translated_lines
 
@@ -635,7 +638,152 @@ def translate_batch(lines, lang, model):
 # ---------------------------
 # Translate all blocks from one SRT
 # ---------------------------
-def translate_blocks(blocks, lang, model):
+# How many batch requests may be in flight at once per file
+MAX_CONCURRENT_BATCHES = 20
+
+# Greedy batch packing budget: target chars of source text per request,
+# capped at a maximum line count
+MAX_BATCH_CHARS = 3000
+MAX_BATCH_ITEMS = 25
+
+def _pack_batches(texts):
+    """Pack lines greedily up to MAX_BATCH_CHARS / MAX_BATCH_ITEMS per batch.
+
+    A fixed count of 10 made request sizes swing wildly with line length;
+    packing to a character budget keeps every request near the same token
+    load, so fewer round-trips do the same total work.
+    """
+    batches = []
+    cur, cur_chars = [], 0
+    for text in texts:
+        if cur and (cur_chars + len(text) > MAX_BATCH_CHARS or len(cur) >= MAX_BATCH_ITEMS):
+            batches.append(cur)
+            cur, cur_chars = [], 0
+        cur.append(text)
+        cur_chars += len(text)
+    if cur:
+        batches.append(cur)
+    return batches
+
+# Translation memory: subtitles repeat short lines constantly ("Hai.",
+# "Nani?", character names), so remember finished translations per
+# (lang, model, source text) and never pay for the same line twice.
+_tm_cache: dict[tuple[str, str, str], str] = {}
+
+# The in-memory cache only lives for one process; serial content repeats
+# the same lines across episodes, so a sqlite table keyed by
+# (model, lang, line hash) carries the memory between runs.
+_TM_DB_DIR = os.path.join(os.path.expanduser("~"), ".cache", "subtitle-translator")
+_tm_db_conn = None
+_tm_db_failed = False
+_tm_db_lock = threading.Lock()
+
+# SQLite caps bound parameters per statement; chunk IN (...) lookups to stay under it
+_TM_SELECT_CHUNK = 500
+
+def _tm_hash(text):
+    """Hash a source line for the on-disk cache key (fast, not crypto)."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+def _tm_db():
+    """Open (once) the persistent translation-memory database, or None if
+    the cache directory isn't writable - the in-memory cache still works."""
+    global _tm_db_conn, _tm_db_failed
+    if _tm_db_conn is None and not _tm_db_failed:
+        try:
+            os.makedirs(_TM_DB_DIR, exist_ok=True)
+            conn = sqlite3.connect(os.path.join(_TM_DB_DIR, "cache.sqlite"),
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS trans ("
+                "model TEXT, lang TEXT, h BLOB, out TEXT, "
+                "PRIMARY KEY (model, lang, h))"
+            )
+            _tm_db_conn = conn
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Persistent translation cache unavailable: %s", e)
+            _tm_db_failed = True
+    return _tm_db_conn
+
+def _load_disk_hits(source_texts, lang, model):
+    """Pull on-disk translations for lines missing from the in-memory cache."""
+    conn = _tm_db()
+    if conn is None:
+        return
+    pending = {}
+    for text in source_texts:
+        if (lang, model, text) not in _tm_cache:
+            pending.setdefault(_tm_hash(text), text)
+    if not pending:
+        return
+    hashes = list(pending)
+    rows = []
+    with _tm_db_lock:
+        for i in range(0, len(hashes), _TM_SELECT_CHUNK):
+            chunk = hashes[i:i + _TM_SELECT_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(conn.execute(
+                f"SELECT h, out FROM trans WHERE model=? AND lang=? AND h IN ({placeholders})",
+                [model, lang, *chunk]
+            ))
+    for h, out in rows:
+        _tm_cache[(lang, model, pending[bytes(h)])] = out
+
+def _partition_by_memory(source_texts, lang, model):
+    """Split sources into memory hits and unique lines still needing the API."""
+    _load_disk_hits(source_texts, lang, model)
+    translated_texts = [None] * len(source_texts)
+    unique_texts = []
+    position = {}
+    for i, text in enumerate(source_texts):
+        cached = _tm_cache.get((lang, model, text))
+        if cached is not None:
+            translated_texts[i] = cached
+        elif text not in position:
+            position[text] = len(unique_texts)
+            unique_texts.append(text)
+    if source_texts:
+        hits = len(source_texts) - sum(t is None for t in translated_texts)
+        logger.info("Translation memory: %d/%d lines served from cache",
+                    hits, len(source_texts))
+    return translated_texts, unique_texts, position
+
+def _fill_from_unique(translated_texts, source_texts, unique_texts, unique_out,
+                      position, lang, model):
+    """Store fresh translations in the memory and fill remaining slots."""
+    new_rows = []
+    for text, translated in zip(unique_texts, unique_out):
+        if translated and translated != "[Translation failed]":
+            _tm_cache[(lang, model, text)] = translated
+            new_rows.append((model, lang, _tm_hash(text), translated))
+    conn = _tm_db()
+    if conn is not None and new_rows:
+        with _tm_db_lock:
+            conn.executemany(
+                "INSERT OR IGNORE INTO trans (model, lang, h, out) VALUES (?, ?, ?, ?)",
+                new_rows
+            )
+            conn.commit()
+    for i, text in enumerate(source_texts):
+        if translated_texts[i] is None:
+            translated_texts[i] = unique_out[position[text]]
+
+def _stitch_blocks(blocks, translated_texts):
+    """Stitch translations back into SRT block format.
+
+    index/start/end carry over verbatim, so the parsed dicts are reused in
+    place rather than rebuilt - one fewer dict allocation per block, which
+    adds up over season-sized jobs. Callers hand over ownership of the
+    block dicts; anyone sharing a parse across jobs must pass copies.
+    """
+    for b, translated_line in zip(blocks, translated_texts):
+        # We output as single-line subtitles. That's intentional to keep it clean.
+        b["lines"] = [translated_line]
+    return blocks
+
+async def translate_blocks_async(blocks, lang, model, semaphore=None,
+                                 rpm_bucket=None, tpm_bucket=None):
     """
     blocks: list of dicts
       {
@@ -646,36 +794,128 @@ def translate_blocks(blocks, lang, model):
       }
 
     returns: (translated_blocks, elapsed_seconds)
+
+    Batches are dispatched concurrently: the work is entirely network-bound,
+    so wall time is ~num_batches x latency / MAX_CONCURRENT_BATCHES instead
+    of num_batches x latency with the old serial loop. Pass shared limiters
+    when several files run in one event loop (the bridge's parallel-file
+    path does) so the tier limits hold across all of them.
     """
     start_t = time.time()
-    translated_blocks = []
-    batch_size = 10
 
-    for i in tqdm(range(0, len(blocks), batch_size), desc=f"Translating {lang}", leave=False, disable=True):
-        batch = blocks[i:i+batch_size]
+    # collapse each block's lines -> "line1 line2"
+    source_texts = [" ".join(b["lines"]) for b in blocks]
+
+    translated_texts, unique_texts, position = _partition_by_memory(source_texts, lang, model)
+
+    batches = _pack_batches(unique_texts)
+
+    if batches:
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+        if rpm_bucket is None:
+            rpm_bucket = AsyncTokenBucket(MAX_REQUESTS_PER_MINUTE)
+        if tpm_bucket is None:
+            tpm_bucket = AsyncTokenBucket(MAX_TOKENS_PER_MINUTE)
+        tasks = [
+            translate_batch_async(lines, lang, model, semaphore, rpm_bucket, tpm_bucket)
+            for lines in batches
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    else:
+        results = []
+
+    unique_out = []
+    for batch_num, (batch, result) in enumerate(zip(batches, results)):
+        if isinstance(result, BaseException):
+            logger.error("Failed batch %d/%d: %s", batch_num + 1, len(batches), result)
+            result = ["[Translation failed]"] * len(batch)
+        for j in range(len(batch)):
+            unique_out.append(result[j] if j < len(result) else "")
+
+    _fill_from_unique(translated_texts, source_texts, unique_texts, unique_out,
+                      position, lang, model)
+    translated_blocks = _stitch_blocks(blocks, translated_texts)
 
-        # collapse each block's lines -> "line1 line2"
-        batch_input_lines = [" ".join(b["lines"]) for b in batch]
+    elapsed = time.time() - start_t
+    return translated_blocks, elapsed
 
-        try:
-            batch_translated_lines = translate_batch(batch_input_lines, lang, model)
-        except Exception as e:
-            print(f"❌ Failed batch ({i}-{i+batch_size}): {e}")
-            batch_translated_lines = ["[Translation failed]"] * len(batch)
+def translate_blocks(blocks, lang, model):
+    """Synchronous entry point: run translate_blocks_async to completion."""
+    return asyncio.run(translate_blocks_async(blocks, lang, model))
 
-        # stitch translation back into SRT block format
-        for j, b in enumerate(batch):
-            translated_line = (
-                batch_translated_lines[j] if j < len(batch_translated_lines) else ""
-            )
+# ---------------------------
+# Offline translation via the OpenAI Batch API
+# ---------------------------
+BATCH_API_POLL_SECONDS = 10
+
+def translate_blocks_batch(blocks, lang, model):
+    """
+    Same contract as translate_blocks, but submits everything as one
+    OpenAI Batch API job: roughly half the per-token price and no
+    rate-limit pressure, in exchange for a completion window of up to
+    24h. Meant for large offline runs where latency doesn't matter.
+    """
+    start_t = time.time()
+
+    source_texts = [" ".join(b["lines"]) for b in blocks]
+    translated_texts, unique_texts, position = _partition_by_memory(source_texts, lang, model)
+
+    batches = _pack_batches(unique_texts)
+    unique_out = [""] * len(unique_texts)
+
+    if batches:
+        client = get_client()
+
+        request_lines = []
+        for batch_num, batch in enumerate(batches):
+            request_lines.append(json.dumps({
+                "custom_id": f"b{batch_num}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": _build_batch_request(batch, lang, model),
+            }))
+        payload = ("\n".join(request_lines) + "\n").encode('utf-8')
+
+        input_file = client.files.create(
+            file=("batch_input.jsonl", payload),
+            purpose="batch"
+        )
+        job = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
 
-            translated_blocks.append({
-                "index": b["index"],
-                "start": b["start"],
-                "end": b["end"],
-                # We output as single-line subtitles. That's intentional to keep it clean.
-                "lines": [translated_line],
-            })
+        while job.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(BATCH_API_POLL_SECONDS)
+            job = client.batches.retrieve(job.id)
+
+        if job.status != "completed":
+            raise RuntimeError(f"Batch job {job.id} ended with status '{job.status}'")
+
+        # Each output line carries the custom_id of the request it answers
+        offsets = []
+        offset = 0
+        for batch in batches:
+            offsets.append(offset)
+            offset += len(batch)
+
+        content = client.files.content(job.output_file_id).text
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            batch_num = int(record["custom_id"][1:])
+            raw = record["response"]["body"]["choices"][0]["message"]["content"].strip()
+            parsed = _parse_batch_response(raw, len(batches[batch_num]))
+            start = offsets[batch_num]
+            for j, translated in enumerate(parsed):
+                unique_out[start + j] = translated
+
+    _fill_from_unique(translated_texts, source_texts, unique_texts, unique_out,
+                      position, lang, model)
+    translated_blocks = _stitch_blocks(blocks, translated_texts)
 
     elapsed = time.time() - start_t
-    return translated_blocks, elapsed
\ No newline at end of file
+    return translated_blocks, elapsed
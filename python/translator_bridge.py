@@ -8,11 +8,24 @@ Handles CLI arguments and outputs JSON for Electron to parse
 import os
 import sys
 import json
-import argparse
-import tiktoken
+import asyncio
+import codecs
+import difflib
+import functools
+import mmap
+import re
+
+# Cache tiktoken's downloaded BPE merge files between process launches;
+# without this every fresh bridge invocation re-fetches/re-parses them.
+# tiktoken itself is imported lazily in _get_encoder - loading its Rust
+# extension costs ~40ms of startup that only the analyze path needs.
+os.environ.setdefault(
+    "TIKTOKEN_CACHE_DIR",
+    os.path.join(os.path.dirname(__file__), "..", "logs", "tiktoken_cache"),
+)
+
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import time
 
 # Add parent directory to path to import our modules
@@ -20,43 +33,199 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
     from srt_utils import parse_srt
-    from translator import translate_blocks, MODEL_PRICES
+    from translator import (
+        translate_blocks, translate_blocks_async, translate_blocks_batch,
+        get_client, get_async_client,
+        AsyncTokenBucket, MODEL_PRICES,
+        MAX_CONCURRENT_BATCHES, MAX_REQUESTS_PER_MINUTE, MAX_TOKENS_PER_MINUTE,
+    )
     from validation_utils import parse_srt_file, validate_subtitle_pair
     from error_handler import ErrorLogger, ErrorType, ErrorSeverity, ErrorRecovery
 except ImportError:
     # Fallback for packaged app
     ErrorLogger = None
 
+# Error-path names resolved once at import instead of a ternary per
+# call; the packaged-app fallback previously hit a NameError because
+# only ErrorLogger was defined
+if ErrorLogger is not None:
+    _ET_TRANSLATION = ErrorType.TRANSLATION_ERROR.value
+    _ET_FILE_WRITE = ErrorType.FILE_WRITE_ERROR.value
+    _ET_PARSING = ErrorType.PARSING_ERROR.value
+    _ET_UNKNOWN = ErrorType.UNKNOWN_ERROR.value
+    _should_retry = ErrorRecovery.should_retry_api_error
+    _retry_delay = ErrorRecovery.get_retry_delay
+else:
+    _ET_TRANSLATION = "translation_error"
+    _ET_FILE_WRITE = "file_write_error"
+    _ET_PARSING = "parsing_error"
+    _ET_UNKNOWN = "unknown_error"
+    def _should_retry(error):
+        return False
+    def _retry_delay(retry_count):
+        return float(2 ** retry_count)
+
+# orjson serializes the progress/error payloads 2-5x faster than json and
+# returns bytes directly; same optional-dependency fallback as error_handler
+try:
+    import orjson
+    _json_bytes = orjson.dumps
+except ImportError:
+    def _json_bytes(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+# Everything Electron reads goes through the binary stdout layer: one
+# write + one flush per line, one lock acquisition, and no
+# UnicodeEncodeError fallback branch for non-ASCII subtitle text.
+_OUT = sys.stdout.buffer
+
+def _emit(prefix: bytes, payload: dict):
+    _OUT.write(prefix + _json_bytes(payload) + b'\n')
+    _OUT.flush()
+
 # Global error logger
 error_logger = ErrorLogger(log_file=os.path.join(os.path.dirname(__file__), "..", "logs", "translation_errors.log")) if ErrorLogger else None
 failed_files = {}  # Track failed files globally
 
-# Lock for thread-safe progress updates
-progress_lock = threading.Lock()
+def _read_text(path):
+    """Read a whole file as UTF-8 text by decoding straight off an mmap.
+
+    f.read() copies the file into a bytes object before decode builds the
+    str - two full passes over the data. Decoding the mapping itself goes
+    from the kernel page cache to the final str in one pass with no
+    intermediate allocation, which matters on big episode files.
+    """
+    with open(path, 'rb') as f:
+        try:
+            # utf-8-sig drops any BOM, which would otherwise survive into
+            # the first block's index and fail its isdigit() check
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return codecs.decode(mm, 'utf-8-sig', 'ignore')
+        except (ValueError, OSError):
+            # empty files can't be mapped; odd filesystems may refuse
+            return f.read().decode('utf-8-sig', 'ignore')
+
+def _iter_srt(root):
+    """Yield paths of every .srt file under root, lazily.
+
+    os.scandir hands back DirEntry objects with cached type info, so the
+    walk costs one readdir per directory instead of a stat per entry the
+    way os.walk's list-building does.
+    """
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    # lowercase only the 4-char suffix, not the whole name
+                    elif entry.name[-4:].lower() == '.srt':
+                        yield entry.path
+        except OSError:
+            continue
+
+# Parsed SRT blocks keyed by path, invalidated on mtime change: with N
+# target languages the per-language workers would otherwise re-read and
+# re-parse the same source file N times.
+_parse_cache = {}
+
+def _parse_cached(srt_path):
+    """Return parsed blocks for a source SRT, reusing them across languages."""
+    mtime = os.path.getmtime(srt_path)
+    hit = _parse_cache.get(srt_path)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+    content = _read_text(srt_path)
+    if not content.strip():
+        raise ValueError("File is empty")
+    blocks = parse_srt(content)
+    _parse_cache[srt_path] = (mtime, blocks)
+    return blocks
+
+# Pricing unpacked once to (input_rate, output_rate, confidence) tuples so
+# the estimate path does a single lookup instead of three dict probes
+_PRICES = {
+    k: (v["input"], v["output"], v.get("confidence", "unknown"))
+    for k, v in MODEL_PRICES.items()
+} if ErrorLogger is not None else {}
+
+# Translations come back at roughly input length (some languages expand,
+# some compress); measured overhead for retries/edge cases is ~5%
+_OUTPUT_MULTIPLIER = 1.05
+_OVERHEAD_FACTOR = 1.05
+
+@functools.lru_cache(maxsize=None)
+def _get_encoder(model):
+    """Memoized tiktoken encoder per model.
+
+    Building an encoder parses a multi-megabyte BPE table; repeated
+    analyze/translate calls in one process should pay that once."""
+    import tiktoken
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception:
+        return tiktoken.get_encoding("cl100k_base")
+
+@functools.lru_cache(maxsize=1024)
+def _count_tokens(model, text):
+    """Token count memoized on (model, text) - static prompts like the
+    estimation system prompt are encoded once process-wide."""
+    return len(_get_encoder(model).encode(text))
+
+# Representative system prompt used for cost estimation (actual prompt
+# from translator.py)
+_EST_SYS_PROMPT = """You are a professional subtitle localization expert specializing in Japanese drama translation.
+
+Your mission:
+- Translate Japanese drama dialogue into natural target language
+- Maintain emotional nuance and cultural context
+- Adapt tone to match scene's emotional weight
+
+Critical Rules:
+- Preserve emotional intensity
+- Keep lines concise and subtitle-friendly
+- Never translate names or places
+- Maintain original emotional depth"""
+
+class _ProgressThrottle:
+    """Coalesce progress updates to one line per percent step (or 0.5 s).
+
+    Every emitted line is a JSON dump plus a pipe flush; on a job with
+    thousands of file-language pairs that synchronous I/O becomes a real
+    wall-clock tax, and the UI can't show sub-percent steps anyway.
+    """
+
+    def __init__(self):
+        self.last_pct = -1.0
+        self.last_t = 0.0
+
+    def ready(self, pct, current, total):
+        now = time.monotonic()
+        if current >= total or pct - self.last_pct >= 1.0 or now - self.last_t > 0.5:
+            self.last_pct = pct
+            self.last_t = now
+            return True
+        return False
+
+_progress_throttle = _ProgressThrottle()
 
 def send_progress(current, total, message=""):
-    """Send progress update to Electron"""
-    progress_data = {
+    """Send progress update to Electron (throttled)"""
+    pct = (current / total * 100) if total > 0 else 0
+    if not _progress_throttle.ready(pct, current, total):
+        return
+    _emit(b"PROGRESS:", {
         "current": current,
         "total": total,
-        "percentage": (current / total * 100) if total > 0 else 0,
+        "percentage": pct,
         "message": message
-    }
-    try:
-        print(f"PROGRESS:{json.dumps(progress_data)}", flush=True)
-    except UnicodeEncodeError:
-        # Fallback for encoding issues
-        sys.stdout.buffer.write(f"PROGRESS:{json.dumps(progress_data)}".encode('utf-8'))
-        sys.stdout.buffer.flush()
+    })
 
 def send_status(status):
     """Send status message to Electron"""
-    try:
-        print(f"STATUS:{status}", flush=True)
-    except UnicodeEncodeError:
-        # Fallback for encoding issues
-        sys.stdout.buffer.write(f"STATUS:{status}".encode('utf-8'))
-        sys.stdout.buffer.flush()
+    _OUT.write(f"STATUS:{status}\n".encode('utf-8'))
+    _OUT.flush()
 
 def send_error(error_type, filename, language, message, details=None, recoverable=False):
     """Send error message to Electron with tracking"""
@@ -68,100 +237,106 @@ def send_error(error_type, filename, language, message, details=None, recoverabl
         "details": details,
         "recoverable": recoverable
     }
-    try:
-        print(f"ERROR:{json.dumps(error_data)}", flush=True)
-    except UnicodeEncodeError:
-        sys.stdout.buffer.write(f"ERROR:{json.dumps(error_data)}".encode('utf-8'))
-        sys.stdout.buffer.flush()
+    _emit(b"ERROR:", error_data)
     
     # Log the error
     if error_logger:
         error_logger.log_error(error_type, "error", filename, language, message, details, recoverable)
 
-def translate_file_worker(srt_path, lang_code, lang_name, output_folder, model, api_key, retry_count=0):
-    """Worker function for translating a single file (used in parallel execution)"""
+def _lang_fields(lang_obj):
+    """Normalize a language entry (legacy string or {code, name} dict)."""
+    if isinstance(lang_obj, dict):
+        lang_code = lang_obj.get('code')
+        return lang_code, lang_obj.get('name', lang_code).capitalize()
+    return lang_obj, lang_obj.capitalize()
+
+# Whitespace runs inside a subtitle line; one C-level sub replaces the
+# per-line strip/split/join idiom
+_WS = re.compile(r'\s+')
+
+# One anchored substitution covers both "name_EN.srt" and "name.srt":
+# sub the match with "_<LANG>.srt" to rename, or with "" to get the base
+# name, instead of chained str.replace passes
+_NAME_RE = re.compile(r'(_EN)?\.srt$', re.IGNORECASE)
+
+def _write_srt(f, translated_blocks):
+    """Stream translated blocks into an open file handle.
+
+    Writing the pieces straight into the (megabyte-buffered) handle skips
+    materializing the whole document in memory first; the kernel can flush
+    early blocks while later ones are still being formatted. Blocks are
+    separated rather than terminated by a blank line so the file ends with
+    exactly one newline, matching the old strip()-then-write output.
+    """
+    w = f.write
+    first = True
+    for b in translated_blocks:
+        if not first:
+            w("\n")
+        first = False
+        w(str(b["index"]).strip())
+        w("\n")
+        w(b["start"].strip())
+        w(" --> ")
+        w(b["end"].strip())
+        w("\n")
+        for l in b["lines"]:
+            w(_WS.sub(' ', l).strip())
+            w("\n")
+
+def _write_translated(translated_blocks, filename, lang_code, lang_name, output_folder):
+    """Render translated blocks to <output>/<language>/<name>; returns the new filename."""
+    new_name = _NAME_RE.sub(f"_{lang_code.upper()}.srt", filename)
+
+    # Language folders are pre-created by translate_files, so no
+    # stat/mkdir per completed pair
+    out_path = os.path.join(output_folder, lang_name, new_name)
+
+    # newline='\n' disables per-write newline translation on Windows
+    with open(out_path, 'w', encoding='utf-8', buffering=1 << 20, newline='\n') as f:
+        _write_srt(f, translated_blocks)
+
+    return new_name
+
+async def _translate_pair_async(srt_path, blocks, lang_code, lang_name, output_folder,
+                                model, semaphore, rpm_bucket, tpm_bucket, retry_count=0):
+    """Translate one (file, language) pair inside the shared event loop."""
     filename = os.path.basename(srt_path)
-    
+
     try:
-        # CRITICAL: Set API key for this thread
-        os.environ['OPENAI_API_KEY'] = api_key
-        
-        # Read and parse SRT
-        try:
-            with open(srt_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            if not content.strip():
-                raise ValueError("File is empty")
-                
-            blocks = parse_srt(content)
-            if not blocks:
-                raise ValueError("No subtitle blocks found in file")
-                
-        except FileNotFoundError:
-            error_msg = f"File not found: {srt_path}"
-            send_error(ErrorType.FILE_READ_ERROR.value if ErrorType else "file_read_error", 
-                      filename, lang_name, error_msg, recoverable=False)
-            return {"success": False, "filename": filename, "lang": lang_name, "error": error_msg}
-        except Exception as e:
-            error_msg = f"Failed to read/parse file: {str(e)}"
-            send_error(ErrorType.PARSING_ERROR.value if ErrorType else "parsing_error", 
-                      filename, lang_name, error_msg, recoverable=True)
-            return {"success": False, "filename": filename, "lang": lang_name, "error": error_msg}
-        
         # Translate with error handling
         try:
-            translated_blocks, elapsed = translate_blocks(blocks, lang_code, model)
+            translated_blocks, elapsed = await translate_blocks_async(
+                blocks, lang_code, model, semaphore, rpm_bucket, tpm_bucket)
         except Exception as e:
-            error_str = str(e).lower()
-            is_retryable = ErrorRecovery.should_retry_api_error(e) if ErrorRecovery else False
+            is_retryable = _should_retry(e)
             error_msg = f"Translation failed: {str(e)}"
-            
-            send_error(ErrorType.TRANSLATION_ERROR.value if ErrorType else "translation_error", 
-                      filename, lang_name, error_msg, 
+
+            send_error(_ET_TRANSLATION,
+                      filename, lang_name, error_msg,
                       {"retry_count": retry_count, "error": str(e)},
                       recoverable=is_retryable)
-            
+
             # Auto-retry for retryable errors
             if is_retryable and retry_count < 3:
-                retry_delay = ErrorRecovery.get_retry_delay(retry_count) if ErrorRecovery else 2 ** retry_count
+                retry_delay = _retry_delay(retry_count)
                 send_status(f"⏳ Retrying {filename} → {lang_name} after {retry_delay}s...")
-                time.sleep(retry_delay)
-                return translate_file_worker(srt_path, lang_code, lang_name, output_folder, model, api_key, retry_count + 1)
-            
+                await asyncio.sleep(retry_delay)
+                return await _translate_pair_async(
+                    srt_path, blocks, lang_code, lang_name, output_folder,
+                    model, semaphore, rpm_bucket, tpm_bucket, retry_count + 1)
+
             return {"success": False, "filename": filename, "lang": lang_name, "error": error_msg}
-        
+
         # Save translated file
         try:
-            new_name = filename.replace("_EN", f"_{lang_code.upper()}")
-            if not new_name.endswith(f"_{lang_code.upper()}.srt"):
-                new_name = filename.replace(".srt", f"_{lang_code.upper()}.srt")
-            
-            lang_folder = os.path.join(output_folder, lang_name)
-            os.makedirs(lang_folder, exist_ok=True)
-            out_path = os.path.join(lang_folder, new_name)
-            
-            # Rebuild SRT with error handling
-            lines = []
-            for b in translated_blocks:
-                lines.append(str(b["index"]).strip())
-                lines.append(f"{b['start'].strip()} --> {b['end'].strip()}")
-                for l in b["lines"]:
-                    clean_line = " ".join(l.strip().split())
-                    lines.append(clean_line)
-                lines.append("")
-            
-            output_content = "\n".join(lines).strip() + "\n"
-            
-            with open(out_path, 'w', encoding='utf-8') as f:
-                f.write(output_content)
-                
+            new_name = _write_translated(translated_blocks, filename, lang_code, lang_name, output_folder)
         except IOError as e:
             error_msg = f"Failed to write file: {str(e)}"
-            send_error(ErrorType.FILE_WRITE_ERROR.value if ErrorType else "file_write_error", 
+            send_error(_ET_FILE_WRITE,
                       filename, lang_name, error_msg, recoverable=False)
             return {"success": False, "filename": filename, "lang": lang_name, "error": error_msg}
-        
+
         return {
             "success": True,
             "filename": filename,
@@ -169,10 +344,10 @@ def translate_file_worker(srt_path, lang_code, lang_name, output_folder, model,
             "lang": lang_name,
             "elapsed": elapsed
         }
-        
+
     except Exception as e:
         error_msg = f"Unexpected error: {str(e)}"
-        send_error(ErrorType.UNKNOWN_ERROR.value if ErrorType else "unknown_error", 
+        send_error(_ET_UNKNOWN,
                   filename, lang_name, error_msg, recoverable=False)
         return {
             "success": False,
@@ -181,18 +356,179 @@ def translate_file_worker(srt_path, lang_code, lang_name, output_folder, model,
             "error": error_msg
         }
 
-def analyze_files(source_folder, model):
-    """Analyze SRT files and return cost estimate with real-world data"""
+def _parse_from_path(srt_path):
+    """Read and parse one SRT (top-level so the process pool can pickle it)."""
+    content = _read_text(srt_path)
+    if not content.strip():
+        raise ValueError("File is empty")
+    return parse_srt(content)
+
+def _collect_parsed(srt_files, languages):
+    """Parse every source file, recording failures; returns (parsed, skipped)."""
+    # Warm the parse cache with a process pool first: parse_srt is pure
+    # Python, so threads would just serialize on the GIL while the CPU
+    # phase ran one core. Failures are left for the sequential loop below
+    # so the error reporting stays in one place.
+    to_parse = []
+    for srt_path in srt_files:
+        try:
+            mtime = os.path.getmtime(srt_path)
+        except OSError:
+            continue
+        hit = _parse_cache.get(srt_path)
+        if hit is None or hit[0] != mtime:
+            to_parse.append((srt_path, mtime))
+    if len(to_parse) > 1:
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(to_parse))) as pool:
+            futures = {pool.submit(_parse_from_path, p): (p, m) for p, m in to_parse}
+            for future in as_completed(futures):
+                srt_path, mtime = futures[future]
+                try:
+                    _parse_cache[srt_path] = (mtime, future.result())
+                except Exception:
+                    pass
+
+    parsed = []
+    skipped = 0
+    for srt_path in srt_files:
+        filename = os.path.basename(srt_path)
+        try:
+            blocks = _parse_cached(srt_path)
+            if not blocks:
+                raise ValueError("No subtitle blocks found in file")
+        except Exception as e:
+            error_msg = f"Failed to parse {filename}: {str(e)}"
+            send_error(_ET_PARSING,
+                      filename, None, error_msg, recoverable=False)
+            failed_files[filename] = str(e)
+            skipped += len(languages)
+            continue
+        parsed.append((srt_path, blocks))
+    return parsed, skipped
+
+def _record_result(result, current_task, total_tasks):
+    """Emit status/progress for one finished pair and track failures."""
+    filename = result["filename"]
+    lang_name = result["lang"]
+    if result["success"]:
+        send_status(f"✅ {filename} → {lang_name} ({result['elapsed']:.1f}s)")
+    else:
+        send_status(f"❌ {filename} → {lang_name}: {result['error']}")
+        failed_files[f"{filename}_{lang_name}"] = result['error']
+    send_progress(current_task, total_tasks, f"{filename} → {lang_name}")
+
+async def _translate_job_async(srt_files, languages, model, output_folder, total_tasks):
+    """Run every (file, language) pair concurrently in one event loop.
+
+    One semaphore and one pair of RPM/TPM buckets are shared by all pairs,
+    so the combined in-flight request load stays inside the account tier
+    while progress streams out as tasks finish.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+    rpm_bucket = AsyncTokenBucket(MAX_REQUESTS_PER_MINUTE)
+    tpm_bucket = AsyncTokenBucket(MAX_TOKENS_PER_MINUTE)
+
+    parsed, skipped = _collect_parsed(srt_files, languages)
+
+    # Language-major dispatch: requests for one language all share the
+    # same (long, stable) system-prompt prefix, and firing them adjacently
+    # keeps OpenAI's automatic prompt cache warm for that prefix, which
+    # discounts the repeated input tokens.
+    tasks = []
+    for lang_obj in languages:
+        lang_code, lang_name = _lang_fields(lang_obj)
+        for srt_path, blocks in parsed:
+            # translate_blocks reuses the block dicts for its output, so each
+            # pair gets shallow copies - the cached parse must stay pristine
+            # for the other languages.
+            tasks.append(asyncio.ensure_future(_translate_pair_async(
+                srt_path, [dict(b) for b in blocks], lang_code, lang_name,
+                output_folder, model, semaphore, rpm_bucket, tpm_bucket)))
+
+    current_task = skipped
+    for future in asyncio.as_completed(tasks):
+        result = await future
+        current_task += 1
+        _record_result(result, current_task, total_tasks)
+
+def _translate_job_batch(srt_files, languages, model, output_folder, total_tasks):
+    """Offline path: one OpenAI Batch API job per (file, language) pair.
+
+    Roughly half the per-token price in exchange for completion-window
+    latency, so it suits unattended runs. Jobs are submitted and polled
+    from a thread pool; results are written as each job finishes.
+    """
+    parsed, skipped = _collect_parsed(srt_files, languages)
+
+    pairs = []
+    for lang_obj in languages:
+        lang_code, lang_name = _lang_fields(lang_obj)
+        for srt_path, blocks in parsed:
+            # Shallow copies for the same reason as the async path: the
+            # translator mutates its blocks in place.
+            pairs.append((srt_path, [dict(b) for b in blocks], lang_code, lang_name))
+
+    def _run(pair):
+        srt_path, blocks, lang_code, lang_name = pair
+        filename = os.path.basename(srt_path)
+        try:
+            translated_blocks, elapsed = translate_blocks_batch(blocks, lang_code, model)
+            new_name = _write_translated(translated_blocks, filename, lang_code, lang_name, output_folder)
+            return {"success": True, "filename": filename, "output_name": new_name,
+                    "lang": lang_name, "elapsed": elapsed}
+        except Exception as e:
+            error_msg = f"Translation failed: {str(e)}"
+            send_error(_ET_TRANSLATION,
+                      filename, lang_name, error_msg, recoverable=False)
+            return {"success": False, "filename": filename, "lang": lang_name, "error": error_msg}
+
+    current_task = skipped
+    if pairs:
+        with ThreadPoolExecutor(max_workers=min(8, len(pairs))) as executor:
+            futures = [executor.submit(_run, pair) for pair in pairs]
+            for future in as_completed(futures):
+                current_task += 1
+                _record_result(future.result(), current_task, total_tasks)
+
+def _approx_tokens(text):
+    """Cheap token estimate: UTF-8 bytes / 3.5 (cl100k average for subtitles).
+
+    Exact BPE counts cost a full tokenizer pass over the corpus; for a
+    budget estimate that already carries a 5% overhead factor, byte length
+    is within a few percent at effectively zero cost.
+    """
+    return (len(text.encode('utf-8')) * 2 + 6) // 7
+
+# Sidecar cache of per-file analyze stats keyed by (mtime, size): each
+# bridge invocation is a fresh process, so a warm re-analyze of a big
+# folder would otherwise re-read and re-tokenize every unchanged file.
+_ANALYZE_CACHE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "logs", "analyze_cache.json")
+
+def _load_analyze_cache():
+    try:
+        with open(_ANALYZE_CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_analyze_cache(cache):
+    try:
+        os.makedirs(os.path.dirname(_ANALYZE_CACHE_PATH), exist_ok=True)
+        with open(_ANALYZE_CACHE_PATH, 'wb') as f:
+            f.write(_json_bytes(cache))
+    except OSError as e:
+        print(f"Failed to save analyze cache: {e}", file=sys.stderr)
+
+def analyze_files(source_folder, model, exact=False):
+    """Analyze SRT files and return cost estimate with real-world data.
+
+    By default token counts are approximated from byte length; pass
+    exact=True (--exact on the CLI) to run the corpus through tiktoken.
+    """
     try:
         # Find all SRT files
-        srt_files = []
-        total_file_size = 0
-        for root, dirs, files in os.walk(source_folder):
-            for file in files:
-                if file.lower().endswith('.srt'):
-                    file_path = os.path.join(root, file)
-                    srt_files.append(file_path)
-                    total_file_size += os.path.getsize(file_path)
+        srt_files = list(_iter_srt(source_folder))
         
         if not srt_files:
             return {
@@ -200,94 +536,111 @@ def analyze_files(source_folder, model):
                 "error": "No SRT files found in the source folder"
             }
         
-        # Get tokenizer
-        try:
-            enc = tiktoken.encoding_for_model(model)
-        except Exception:
-            enc = tiktoken.get_encoding("cl100k_base")
-        
-        # More realistic system prompt (actual prompt from translator.py)
-        base_sys_prompt = """You are a professional subtitle localization expert specializing in Japanese drama translation.
-
-Your mission:
-- Translate Japanese drama dialogue into natural target language
-- Maintain emotional nuance and cultural context
-- Adapt tone to match scene's emotional weight
+        # The approximate mode must stay tiktoken-free: _count_tokens loads
+        # the BPE table, which downloads on a cold cache and fails offline.
+        if exact:
+            sys_prompt_toks = _count_tokens(model, _EST_SYS_PROMPT)
+        else:
+            sys_prompt_toks = _approx_tokens(_EST_SYS_PROMPT)
 
-Critical Rules:
-- Preserve emotional intensity
-- Keep lines concise and subtitle-friendly
-- Never translate names or places
-- Maintain original emotional depth"""
-        
-        sys_prompt_toks = len(enc.encode(base_sys_prompt))
-        
         total_input_toks = 0
         total_output_toks = 0
         total_subtitle_lines = 0
-        
-        # Analyze each file for more accurate estimation
-        for srt_path in srt_files:
+
+        # Collect each file's dialogue text first, then tokenize everything
+        # in one encode_ordinary_batch call: tiktoken parallelizes the batch
+        # internally, and one FFI crossing replaces one per file. Subtitle
+        # content has no special tokens, so the ordinary variant also skips
+        # the special-token scan.
+        # Read and parse the files through a thread pool: the walk order
+        # rarely matches disk layout, and overlapping the reads lets OS
+        # readahead hide most of the latency. Going through _parse_cached
+        # means the estimate counts exactly the lines translate sends and
+        # the translate command later reuses the parsed blocks for free.
+        # Tokenization stays out of the pool - encode_ordinary_batch
+        # already parallelizes in Rust.
+        def _parse(path):
             try:
-                with open(srt_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                
-                # Extract only subtitle text (not timings or indices)
-                lines = [
-                    ln.strip()
-                    for ln in content.splitlines()
-                    if ln.strip()
-                    and not ln.strip().isdigit()
-                    and "-->" not in ln
-                ]
-                
-                total_subtitle_lines += len(lines)
-                
-                # Build realistic user prompt for batch processing
-                # Each batch has about 10 subtitle blocks (20 lines of dialogue)
-                sample_prompt = "You will receive several subtitle lines in English.\nFor EACH line:\n- Translate it separately\n- KEEP the same label\n- Do NOT merge lines\n\nLines:\n"
-                sample_lines = "\n".join([f"[L{i+1}] {lines[i][:50]}" for i in range(min(10, len(lines)))])
-                batch_prompt = sample_prompt + sample_lines
-                batch_prompt_toks = len(enc.encode(batch_prompt))
-                
-                # Calculate tokens per file
-                input_text = "\n".join(lines)
-                input_toks = len(enc.encode(input_text))
-                
-                # Real-world observation: translations typically produce 0.9-1.1x the input length
-                # Some languages expand, some compress. Average 1.0x with 15% variance
-                output_multiplier = 1.05  # Realistic average
-                output_toks = int(input_toks * output_multiplier)
-                
-                # Account for system prompt per batch (batch size ~10 blocks)
-                num_batches = max(1, len(lines) // 20)
-                batch_sys_toks = sys_prompt_toks * num_batches
-                
-                total_input_toks += input_toks + batch_sys_toks
-                total_output_toks += output_toks
-                
+                return _parse_cached(path)
             except Exception as e:
-                print(f"Error processing {srt_path}: {e}", file=sys.stderr)
+                print(f"Error processing {path}: {e}", file=sys.stderr)
+                return None
+
+        # Files whose (mtime, size) signature matches the sidecar cache
+        # reuse their stored stats; only changed files are read, parsed
+        # and tokenized. Exact counts are cached per model, approximate
+        # ones under a shared key since they don't depend on the model.
+        analyze_cache = _load_analyze_cache()
+        mode = model if exact else "approx"
+        stats = []          # (input_toks, n_lines) per counted file
+        to_count = []
+        for path in srt_files:
+            try:
+                st = os.stat(path)
+            except OSError:
                 continue
-        
+            sig = f"{st.st_mtime}:{st.st_size}"
+            entry = analyze_cache.get(f"{path}::{mode}")
+            if entry and entry[0] == sig:
+                stats.append((entry[1], entry[2]))
+            else:
+                to_count.append((path, sig))
+
+        file_texts = []
+        file_lines = []
+        if to_count:
+            with ThreadPoolExecutor(max_workers=min(16, len(to_count))) as ex:
+                parsed = list(ex.map(_parse, (p for p, _ in to_count)))
+
+            counted = []
+            for (path, sig), blocks in zip(to_count, parsed):
+                if blocks is None:
+                    continue
+                lines = [line for b in blocks for line in b["lines"]]
+                file_texts.append("\n".join(lines))
+                file_lines.append(len(lines))
+                counted.append((path, sig))
+
+            if exact:
+                enc = _get_encoder(model)
+                toks_per_file = [
+                    len(t) for t in enc.encode_ordinary_batch(
+                        file_texts, num_threads=min(32, os.cpu_count() or 1)
+                    )
+                ]
+            else:
+                toks_per_file = [_approx_tokens(t) for t in file_texts]
+
+            for (path, sig), input_toks, n_lines in zip(counted, toks_per_file, file_lines):
+                analyze_cache[f"{path}::{mode}"] = [sig, input_toks, n_lines]
+                stats.append((input_toks, n_lines))
+            if counted:
+                _save_analyze_cache(analyze_cache)
+
+        for input_toks, n_lines in stats:
+            total_subtitle_lines += n_lines
+            # Account for system prompt per batch (batch size ~10 blocks)
+            num_batches = max(1, n_lines // 20)
+            total_input_toks += input_toks + sys_prompt_toks * num_batches
+            total_output_toks += int(input_toks * _OUTPUT_MULTIPLIER)
+
+
         if total_input_toks == 0:
             return {
                 "success": False,
                 "error": "No valid subtitle content found"
             }
         
-        # Add realistic overhead (not 15%, actual measured ~5% for retries/edge cases)
-        overhead_factor = 1.05
-        total_input_toks = int(total_input_toks * overhead_factor)
-        total_output_toks = int(total_output_toks * overhead_factor)
+        # Add realistic overhead
+        total_input_toks = int(total_input_toks * _OVERHEAD_FACTOR)
+        total_output_toks = int(total_output_toks * _OVERHEAD_FACTOR)
         total_tokens = total_input_toks + total_output_toks
         
         # Calculate cost based on real OpenAI pricing
-        if model in MODEL_PRICES:
-            m = MODEL_PRICES[model]
-            usd = (total_input_toks * m["input"]) + (total_output_toks * m["output"])
+        if model in _PRICES:
+            input_rate, output_rate, confidence = _PRICES[model]
+            usd = (total_input_toks * input_rate) + (total_output_toks * output_rate)
             inr = usd * 83.0
-            confidence = m.get("confidence", "high")
         else:
             usd = 0
             inr = 0
@@ -302,10 +655,11 @@ Critical Rules:
             "costUSD": usd,
             "costINR": inr,
             "confidence": confidence,
+            "approximate": not exact,
             "fileNames": [os.path.basename(f) for f in srt_files]
         }
         
-        print(json.dumps(result))
+        _emit(b"", result)
         return result
         
     except Exception as e:
@@ -314,7 +668,7 @@ Critical Rules:
             "error": str(e)
         }
 
-def translate_files(source_folder, output_folder, languages, model, api_key, parallel_languages=False, parallel_files=False):
+def translate_files(source_folder, output_folder, languages, model, api_key, parallel_languages=False, parallel_files=False, use_batch=False):
     """Translate SRT files to target languages with optional parallel processing"""
     try:
         global failed_files
@@ -341,71 +695,44 @@ def translate_files(source_folder, output_folder, languages, model, api_key, par
         if error_logger:
             error_logger.clear_log()
         
-        # Set API key
-        os.environ['OPENAI_API_KEY'] = api_key
-        
+        # Prime the memoized client with an explicit key instead of
+        # mutating os.environ: putenv can serialize on a global lock and
+        # the env write leaked the key to every child process
+        if use_batch:
+            get_client(api_key)
+        else:
+            get_async_client(api_key)
+
         # Find all SRT files
-        srt_files = []
-        for root, dirs, files in os.walk(source_folder):
-            for file in files:
-                if file.lower().endswith('.srt'):
-                    srt_files.append(os.path.join(root, file))
-        
+        srt_files = list(_iter_srt(source_folder))
+
         if not srt_files:
             send_status("❌ No SRT files found")
             return {"success": False, "error": "No SRT files found", "failed_files": {}}
         
         send_status(f"📝 Found {len(srt_files)} file(s) to translate")
-        
-        # Display translation mode
-        mode = "Sequential"
-        if parallel_languages and parallel_files:
-            mode = "Maximum Speed (files + languages parallel)"
-        elif parallel_languages:
-            mode = "Parallel Languages"
-        elif parallel_files:
-            mode = "Parallel Files"
-        
-        send_status(f"⚡ Mode: {mode}")
-        
-        # Create output directory
+
+        # One asyncio scheduler replaces the old thread-pool modes: every
+        # (file, language) pair runs concurrently under shared rate limits,
+        # so the legacy parallel flags no longer change the execution plan.
+        send_status("💤 Mode: Batch API (offline, ~50% cost)" if use_batch
+                    else "⚡ Mode: Concurrent (files + languages)")
+
+        # Create the output directory and every language folder up front:
+        # known from the language list, and doing it here spares every
+        # completed pair a stat/mkdir under concurrency
         os.makedirs(output_folder, exist_ok=True)
-        
+        for lang_obj in languages:
+            _, lang_name = _lang_fields(lang_obj)
+            os.makedirs(os.path.join(output_folder, lang_name), exist_ok=True)
+
         total_tasks = len(srt_files) * len(languages)
-        current_task = 0
-        
-        # Process files in parallel or sequentially
-        if parallel_files:
-            # Translate multiple files at the same time
-            send_status(f"⚡ Processing {len(srt_files)} file(s) in parallel...")
-            with ThreadPoolExecutor(max_workers=min(len(srt_files), 4)) as executor:
-                futures = {}
-                
-                for file_idx, srt_path in enumerate(srt_files, 1):
-                    future = executor.submit(
-                        translate_single_file,
-                        srt_path, file_idx, len(srt_files), languages, model, api_key, parallel_languages, output_folder
-                    )
-                    futures[future] = srt_path
-                
-                # Collect results as they complete
-                for future in as_completed(futures):
-                    result = future.result()
-                    if result.get("success") or result.get("partial_failure"):
-                        current_task += result.get("task_count", 0)
-                        send_progress(current_task, total_tasks, result.get("message", ""))
-                    else:
-                        send_status(f"❌ Error: {result.get('error', 'Unknown error')}")
+
+        if use_batch:
+            _translate_job_batch(srt_files, languages, model, output_folder, total_tasks)
         else:
-            # Translate files sequentially
-            for file_idx, srt_path in enumerate(srt_files, 1):
-                result = translate_single_file(
-                    srt_path, file_idx, len(srt_files), languages, model, api_key, parallel_languages, output_folder
-                )
-                if result.get("success") or result.get("partial_failure"):
-                    current_task += result.get("task_count", 0)
-                    send_progress(current_task, total_tasks, result.get("message", ""))
-        
+            asyncio.run(_translate_job_async(srt_files, languages, model, output_folder, total_tasks))
+
         # Final status
         if failed_files:
             send_status(f"⚠️  Translation completed with {len(failed_files)} error(s)")
@@ -429,117 +756,11 @@ def translate_files(source_folder, output_folder, languages, model, api_key, par
     except Exception as e:
         error_msg = str(e)
         send_status(f"❌ Error: {error_msg}")
-        send_error(ErrorType.UNKNOWN_ERROR.value if ErrorType else "unknown_error", 
+        send_error(_ET_UNKNOWN, 
                   "translator", None, error_msg, recoverable=False)
         print(f"Translation error: {e}", file=sys.stderr)
         return {"success": False, "error": error_msg, "failed_files": failed_files}
 
-def translate_single_file(srt_path, file_idx, total_files, languages, model, api_key, parallel_languages, output_folder):
-    """Translate a single file to all languages"""
-    filename = os.path.basename(srt_path)
-    
-    try:
-        # Set API key for this thread
-        os.environ['OPENAI_API_KEY'] = api_key
-        
-        send_status(f"📄 [{file_idx}/{total_files}] Processing: {filename}")
-        
-        # Parse source file once
-        try:
-            with open(srt_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            blocks = parse_srt(content)
-            
-            if not blocks:
-                raise ValueError("No subtitle blocks found in file")
-                
-        except Exception as e:
-            error_msg = f"Failed to parse {filename}: {str(e)}"
-            send_error(ErrorType.PARSING_ERROR.value if ErrorType else "parsing_error", 
-                      filename, None, error_msg, recoverable=False)
-            failed_files[filename] = str(e)
-            return {"success": False, "task_count": len(languages), "message": error_msg, "error": error_msg}
-        
-        task_count = len(languages)
-        file_failed = False
-        failed_langs = []
-        
-        if parallel_languages:
-            # Translate to all languages IN PARALLEL
-            with ThreadPoolExecutor(max_workers=len(languages)) as executor:
-                futures = {}
-                
-                for lang_obj in languages:
-                    # Handle both old format (string) and new format (dict)
-                    if isinstance(lang_obj, dict):
-                        lang_code = lang_obj.get('code')
-                        lang_name = lang_obj.get('name', lang_code).capitalize()
-                    else:
-                        lang_code = lang_obj
-                        lang_name = lang_obj.capitalize()
-                    
-                    # Submit translation task for this language
-                    future = executor.submit(
-                        translate_file_worker,
-                        srt_path, lang_code, lang_name, output_folder, model, api_key
-                    )
-                    futures[future] = lang_name
-                
-                # Collect results as they complete
-                completed_langs = 0
-                for future in as_completed(futures):
-                    result = future.result()
-                    completed_langs += 1
-                    lang_name = futures[future]
-                    
-                    if result["success"]:
-                        send_status(f"✅ {filename} → {lang_name} ({result['elapsed']:.1f}s)")
-                    else:
-                        file_failed = True
-                        failed_langs.append((lang_name, result['error']))
-                        send_status(f"❌ {filename} → {lang_name}: {result['error']}")
-                        failed_files[f"{filename}_{lang_name}"] = result['error']
-        else:
-            # Translate each language sequentially
-            for lang_obj in languages:
-                # Handle both old format (string) and new format (dict)
-                if isinstance(lang_obj, dict):
-                    lang_code = lang_obj.get('code')
-                    lang_name = lang_obj.get('name', lang_code).capitalize()
-                else:
-                    lang_code = lang_obj
-                    lang_name = lang_obj.capitalize()
-                
-                result = translate_file_worker(
-                    srt_path, lang_code, lang_name, output_folder, model, api_key
-                )
-                
-                if result["success"]:
-                    send_status(f"✅ {filename} → {lang_name} ({result['elapsed']:.1f}s)")
-                else:
-                    file_failed = True
-                    failed_langs.append((lang_name, result['error']))
-                    send_status(f"❌ {filename} → {lang_name}: {result['error']}")
-                    failed_files[f"{filename}_{lang_name}"] = result['error']
-        
-        if file_failed:
-            return {
-                "success": True,  # File processing completed, but some languages failed
-                "task_count": task_count,
-                "message": f"[{file_idx}/{total_files}] {filename} - some languages failed",
-                "partial_failure": True,
-                "failed_languages": failed_langs
-            }
-        
-        return {"success": True, "task_count": task_count, "message": f"[{file_idx}/{total_files}] {filename} complete"}
-        
-    except Exception as e:
-        error_msg = f"Unexpected error processing {filename}: {str(e)}"
-        send_error(ErrorType.UNKNOWN_ERROR.value if ErrorType else "unknown_error", 
-                  filename, None, error_msg, recoverable=False)
-        failed_files[filename] = str(e)
-        return {"success": False, "error": error_msg, "task_count": 0}
-
 def validate_translations(output_folder, source_folder):
     """Validate translated files against source English files (OPTIMIZED)"""
     try:
@@ -549,89 +770,123 @@ def validate_translations(output_folder, source_folder):
         source_files = {}
         source_blocks = {}
         
-        for root, dirs, files in os.walk(source_folder):
-            for file in files:
-                if file.lower().endswith('.srt'):
-                    filepath = os.path.join(root, file)
-                    # Get base name without language suffix
-                    base_name = file.replace('_EN', '').replace('.srt', '')
-                    
-                    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                    
-                    blocks = parse_srt_file(content)
-                    source_files[base_name] = file
-                    source_blocks[base_name] = blocks
-        
+        # Read and parse through a thread pool: the reads overlap in the OS
+        # and parse_srt_file on one file doesn't need the others.
+        def _read_parse(filepath):
+            return filepath, parse_srt_file(_read_text(filepath))
+
+        pool_size = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=pool_size) as ex:
+            for filepath, blocks in ex.map(_read_parse, _iter_srt(source_folder)):
+                file = os.path.basename(filepath)
+                # Get base name without language suffix
+                base_name = _NAME_RE.sub('', file)
+                source_files[base_name] = file
+                source_blocks[base_name] = blocks
+
         if not source_blocks:
             return {"success": False, "error": "No source SRT files found"}
-        
-        # Validate each language folder
+
+        # Case-folded lookup built once: each output file then resolves its
+        # source with O(1) dict gets instead of scanning every source name.
+        lowered = {k.lower(): k for k in source_blocks}
+
+        # Collect every output file up front so one pool pass overlaps all
+        # their reads and parses too; validation below consumes the parsed
+        # blocks sequentially, keeping error reporting in one place.
+        out_entries = []
         for lang_folder in os.listdir(output_folder):
             lang_path = os.path.join(output_folder, lang_folder)
             if not os.path.isdir(lang_path):
                 continue
-            
-            lang_results = []
-            
             for output_file in os.listdir(lang_path):
-                if not output_file.lower().endswith('.srt'):
-                    continue
-                
-                output_filepath = os.path.join(lang_path, output_file)
-                
-                # Extract base name from output file
-                base_name = output_file.replace(f'_{lang_folder.upper()}', '').replace('.srt', '')
-                
-                # Find matching source file
-                source_blocks_data = None
-                for src_base, src_blocks in source_blocks.items():
-                    if src_base == base_name or src_base in output_file.lower():
-                        source_blocks_data = src_blocks
+                if output_file.lower().endswith('.srt'):
+                    out_entries.append((lang_folder, output_file,
+                                        os.path.join(lang_path, output_file)))
+
+        def _parse_output(entry):
+            try:
+                return parse_srt_file(_read_text(entry[2]))
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=pool_size) as ex:
+            parsed_outputs = list(ex.map(_parse_output, out_entries))
+
+        # Validate each output against its parsed source; results keep the
+        # walk order because dicts preserve insertion order
+        by_lang = {}
+        for (lang_folder, output_file, output_filepath), output_blocks in zip(
+                out_entries, parsed_outputs):
+            lang_results = by_lang.setdefault(lang_folder, [])
+
+            # Extract base name from output file
+            base_name = output_file.replace(f'_{lang_folder.upper()}', '').replace('.srt', '')
+
+            # Find matching source file: exact key, then case-folded
+            # candidates, then one fuzzy pass for renamed outputs
+            source_blocks_data = source_blocks.get(base_name)
+            if source_blocks_data is None:
+                candidates = (
+                    base_name.lower(),
+                    output_file.lower().replace(f'_{lang_folder.lower()}.srt', ''),
+                )
+                for candidate in candidates:
+                    key = lowered.get(candidate)
+                    if key is not None:
+                        source_blocks_data = source_blocks[key]
                         break
-                
-                if not source_blocks_data:
-                    # Try alternative matching
-                    continue
-                
-                # Read output file (optimized: only parse if source found)
-                try:
-                    with open(output_filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                        output_content = f.read()
-                    output_blocks = parse_srt_file(output_content)
-                    
-                    # Validate (already optimized in validation_utils.py)
-                    result = validate_subtitle_pair(
-                        source_blocks_data,
-                        output_blocks,
-                        output_file,
-                        lang_folder
-                    )
-                    
-                    lang_results.append({
-                        "filename": output_file,
-                        "passed": result.passed,
-                        "match_rate": result.match_rate,
-                        "en_blocks": result.en_block_count,
-                        "target_blocks": result.target_block_count,
-                        "issues": [
-                            {
-                                "type": issue.issue_type,
-                                "severity": issue.severity,
-                                "block": issue.block_index,
-                                "message": issue.message
-                            }
-                            for issue in result.issues
-                        ]
-                    })
-                    
-                except Exception as e:
-                    lang_results.append({
-                        "filename": output_file,
-                        "passed": False,
-                        "error": str(e)
-                    })
-            
+            if source_blocks_data is None:
+                close = difflib.get_close_matches(base_name.lower(), lowered, n=1, cutoff=0.8)
+                if close:
+                    source_blocks_data = source_blocks[lowered[close[0]]]
+
+            if not source_blocks_data:
+                # Try alternative matching
+                continue
+
+            if isinstance(output_blocks, Exception):
+                lang_results.append({
+                    "filename": output_file,
+                    "passed": False,
+                    "error": str(output_blocks)
+                })
+                continue
+
+            try:
+                # Validate (already optimized in validation_utils.py)
+                result = validate_subtitle_pair(
+                    source_blocks_data,
+                    output_blocks,
+                    output_file,
+                    lang_folder
+                )
+
+                lang_results.append({
+                    "filename": output_file,
+                    "passed": result.passed,
+                    "match_rate": result.match_rate,
+                    "en_blocks": result.en_block_count,
+                    "target_blocks": result.target_block_count,
+                    "issues": [
+                        {
+                            "type": issue.issue_type,
+                            "severity": issue.severity,
+                            "block": issue.block_index,
+                            "message": issue.message
+                        }
+                        for issue in result.issues
+                    ]
+                })
+
+            except Exception as e:
+                lang_results.append({
+                    "filename": output_file,
+                    "passed": False,
+                    "error": str(e)
+                })
+
+        for lang_folder, lang_results in by_lang.items():
             if lang_results:
                 validation_results.append({
                     "language": lang_folder,
@@ -639,7 +894,7 @@ def validate_translations(output_folder, source_folder):
                     "passed_count": sum(1 for r in lang_results if r.get("passed", False)),
                     "total_count": len(lang_results)
                 })
-        
+
         return {
             "success": True,
             "validations": validation_results
@@ -651,19 +906,16 @@ def validate_translations(output_folder, source_folder):
 def retranslate_file(source_folder, output_folder, filename, language, model, api_key):
     """Retranslate a single file that failed validation"""
     try:
-        # Set API key for this operation
-        os.environ['OPENAI_API_KEY'] = api_key
-        
+        # Prime the memoized client with this operation's key
+        get_async_client(api_key)
+
         # Find the source file
         source_file = None
-        for root, dirs, files in os.walk(source_folder):
-            for file in files:
-                if file.lower().endswith('.srt'):
-                    base_name = filename.replace(f'_{language.upper()}', '').replace('.srt', '')
-                    if base_name in file or file.replace('_EN', '').replace('.srt', '') == base_name:
-                        source_file = os.path.join(root, file)
-                        break
-            if source_file:
+        base_name = filename.replace(f'_{language.upper()}', '').replace('.srt', '')
+        for path in _iter_srt(source_folder):
+            file = os.path.basename(path)
+            if base_name in file or _NAME_RE.sub('', file) == base_name:
+                source_file = path
                 break
         
         if not source_file:
@@ -671,8 +923,7 @@ def retranslate_file(source_folder, output_folder, filename, language, model, ap
             return {"success": False, "error": "Source file not found"}
         
         # Parse source file
-        with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-            source_content = f.read()
+        source_content = _read_text(source_file)
         blocks = parse_srt(source_content)
         
         if not blocks:
@@ -688,25 +939,14 @@ def retranslate_file(source_folder, output_folder, filename, language, model, ap
             translated_blocks, elapsed = translate_blocks(blocks, language, model)
         except Exception as e:
             error_msg = f"Translation failed: {str(e)}"
-            send_error(ErrorType.TRANSLATION_ERROR.value if ErrorType else "translation_error",
+            send_error(_ET_TRANSLATION,
                       filename, language, error_msg, recoverable=False)
             return {"success": False, "error": error_msg}
         
         # Write output file
         output_path = os.path.join(lang_folder, filename)
-        lines = []
-        for b in translated_blocks:
-            lines.append(str(b["index"]).strip())
-            lines.append(f"{b['start'].strip()} --> {b['end'].strip()}")
-            for l in b["lines"]:
-                clean_line = " ".join(l.strip().split())
-                lines.append(clean_line)
-            lines.append("")
-        
-        output_content = "\n".join(lines).strip() + "\n"
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(output_content)
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20, newline='\n') as f:
+            _write_srt(f, translated_blocks)
         
         send_status(f"✅ {filename} retranslated successfully ({elapsed:.1f}s)")
         return {"success": True, "message": f"File {filename} retranslated", "elapsed": elapsed}
@@ -715,80 +955,103 @@ def retranslate_file(source_folder, output_folder, filename, language, model, ap
         send_status(f"ERROR: {str(e)}")
         return {"success": False, "error": str(e)}
 
+# Flags that take no value; everything else consumes the next token
+# (--langs consumes every token up to the next flag).
+_CLI_SWITCHES = frozenset({'exact', 'parallel_langs', 'parallel_files', 'batch'})
+
+_CLI_USAGE = (
+    b"Usage: translator_bridge.py {analyze|translate|validate|retranslate} [--flags]\n"
+)
+
+def _parse_cli(argv):
+    """Minimal flag parser for the four bridge commands.
+
+    argparse built five ArgumentParser objects on every launch to run
+    exactly one subcommand; the flag set is fixed and Electron is the
+    only caller, so a plain scan over sys.argv covers it without the
+    import or the setup cost.
+    """
+    if not argv:
+        return None, {}
+    cmd = argv[0]
+    args = {}
+    i = 1
+    n = len(argv)
+    while i < n:
+        tok = argv[i]
+        if not tok.startswith('--'):
+            i += 1
+            continue
+        name = tok[2:].replace('-', '_')
+        if name in _CLI_SWITCHES:
+            args[name] = True
+            i += 1
+        elif name == 'langs':
+            values = []
+            i += 1
+            while i < n and not argv[i].startswith('--'):
+                values.append(argv[i])
+                i += 1
+            args[name] = values
+        else:
+            if i + 1 < n:
+                args[name] = argv[i + 1]
+            i += 2
+    return cmd, args
+
 def main():
-    parser = argparse.ArgumentParser(description='Subtitle Translator Bridge')
-    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
-    
-    # Analyze command
-    analyze_parser = subparsers.add_parser('analyze', help='Analyze files and estimate cost')
-    analyze_parser.add_argument('--source', required=True, help='Source folder path')
-    analyze_parser.add_argument('--model', required=True, help='Model name')
-    
-    # Translate command
-    translate_parser = subparsers.add_parser('translate', help='Translate files')
-    translate_parser.add_argument('--source', required=True, help='Source folder path')
-    translate_parser.add_argument('--output', required=True, help='Output folder path')
-    translate_parser.add_argument('--langs', nargs='+', required=True, help='Target languages')
-    translate_parser.add_argument('--model', required=True, help='Model name')
-    translate_parser.add_argument('--api-key', required=True, help='OpenAI API key')
-    translate_parser.add_argument('--parallel-langs', action='store_true', help='Translate all languages in parallel')
-    translate_parser.add_argument('--parallel-files', action='store_true', help='Translate multiple files in parallel')
-    
-    # Validate command
-    validate_parser = subparsers.add_parser('validate', help='Validate translated files')
-    validate_parser.add_argument('--output', required=True, help='Output folder path')
-    validate_parser.add_argument('--source', required=True, help='Source folder path')
-    
-    # Retranslate command
-    retranslate_parser = subparsers.add_parser('retranslate', help='Retranslate a failed file')
-    retranslate_parser.add_argument('--source', required=True, help='Source folder path')
-    retranslate_parser.add_argument('--output', required=True, help='Output folder path')
-    retranslate_parser.add_argument('--file', required=True, help='Filename to retranslate')
-    retranslate_parser.add_argument('--language', required=True, help='Target language')
-    retranslate_parser.add_argument('--model', required=True, help='Model name')
-    retranslate_parser.add_argument('--api-key', required=True, help='OpenAI API key')
-    
-    args = parser.parse_args()
-    
-    if args.command == 'analyze':
-        result = analyze_files(args.source, args.model)
-        if not result.get('success'):
-            sys.exit(1)
-    
-    elif args.command == 'translate':
-        result = translate_files(
-            args.source,
-            args.output,
-            args.langs,
-            args.model,
-            args.api_key,
-            parallel_languages=args.parallel_langs,
-            parallel_files=args.parallel_files
-        )
-        if not result.get('success'):
-            sys.exit(1)
-    
-    elif args.command == 'validate':
-        result = validate_translations(args.output, args.source)
-        print(json.dumps(result))
-        if not result.get('success'):
-            sys.exit(1)
-    
-    elif args.command == 'retranslate':
-        result = retranslate_file(
-            args.source,
-            args.output,
-            args.file,
-            args.language,
-            args.model,
-            args.api_key
-        )
-        print(json.dumps(result))
-        if not result.get('success'):
+    command, args = _parse_cli(sys.argv[1:])
+
+    # Resolve required flags before running anything, so the KeyError
+    # handler can only ever see missing-flag lookups - not KeyErrors
+    # raised inside command execution.
+    try:
+        if command == 'analyze':
+            run = functools.partial(analyze_files, args['source'], args['model'],
+                                    exact=args.get('exact', False))
+            emit_result = False
+        elif command == 'translate':
+            run = functools.partial(
+                translate_files,
+                args['source'],
+                args['output'],
+                args['langs'],
+                args['model'],
+                args['api_key'],
+                parallel_languages=args.get('parallel_langs', False),
+                parallel_files=args.get('parallel_files', False),
+                use_batch=args.get('batch', False)
+            )
+            emit_result = False
+        elif command == 'validate':
+            run = functools.partial(validate_translations,
+                                    args['output'], args['source'])
+            emit_result = True
+        elif command == 'retranslate':
+            run = functools.partial(
+                retranslate_file,
+                args['source'],
+                args['output'],
+                args['file'],
+                args['language'],
+                args['model'],
+                args['api_key']
+            )
+            emit_result = True
+        else:
+            _OUT.write(_CLI_USAGE)
+            _OUT.flush()
             sys.exit(1)
-    
-    else:
-        parser.print_help()
+    except KeyError as e:
+        _OUT.write(f"Missing required flag --{e.args[0].replace('_', '-')}\n".encode('utf-8'))
+        _OUT.write(_CLI_USAGE)
+        _OUT.flush()
+        sys.exit(2)
+
+    result = run()
+    if emit_result:
+        _emit(b"", result)
+    if not result.get('success'):
         sys.exit(1)
 
 if __name__ == '__main__':
@@ -6,6 +6,7 @@ Checks for common issues in translated subtitle files
 """
 
 import re
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 
@@ -13,28 +14,27 @@ TIMESTAMP_RE = re.compile(
     r"^(\d{2}):(\d{2}):(\d{2}),(\d{3})\s*-->\s*(\d{2}):(\d{2}):(\d{2}),(\d{3})$"
 )
 
-@dataclass
+# A badly broken file can fail on every block; past this many detailed
+# issues the extra entries add JSON bulk for the frontend, not information.
+MAX_ISSUES = 50
+
+@dataclass(slots=True)
 class SubtitleBlock:
     index: Optional[int]
-    start_time: str
-    end_time: str
+    # Milliseconds from 00:00:00,000 -- int equality beats comparing two
+    # 12-char strings, and two machine ints are far smaller than two str
+    # objects per block. format_timestamp() renders the SRT form back.
+    start_time: int
+    end_time: int
     text_lines: List[str]
     line_number: int
+    # Computed once at parse time rather than as properties:
+    # validate_subtitle_pair reads has_text twice per block pair, and a
+    # stored bool beats re-stripping every line on each read.
+    has_text: bool = False
+    text_preview: str = ""
 
-    @property
-    def has_text(self) -> bool:
-        for line in self.text_lines:
-            if line.strip():
-                return True
-        return False
-
-    @property
-    def text_preview(self) -> str:
-        if self.text_lines:
-            return self.text_lines[0].strip()[:80]
-        return ""
-
-@dataclass
+@dataclass(slots=True)
 class ValidationIssue:
     issue_type: str
     severity: str  # "error", "warning"
@@ -42,7 +42,7 @@ class ValidationIssue:
     message: str
     details: Optional[Dict] = None
 
-@dataclass
+@dataclass(slots=True)
 class ValidationResult:
     filename: str
     target_language: str
@@ -52,43 +52,85 @@ class ValidationResult:
     target_block_count: int
     match_rate: float
 
-def parse_timestamp_line(line: str) -> Optional[Tuple[str, str]]:
-    """Parse timestamp line and return (start_time, end_time)"""
-    m = TIMESTAMP_RE.match(line.strip())
+# Memoized: parse_srt_file checks every timestamp line twice (once as the
+# current block's timestamp, once as the previous block's lookahead), and
+# validate_translations parses the same English reference once per target
+# language.
+@lru_cache(maxsize=8192)
+def parse_timestamp_line(line: str, _match=TIMESTAMP_RE.match) -> Optional[Tuple[int, int]]:
+    """Parse timestamp line and return (start_time, end_time) in milliseconds"""
+    line = line.strip()
+    # Fast path: well-formed lines are exactly "HH:MM:SS,mmm --> HH:MM:SS,mmm"
+    # (29 chars), so a length test plus separator checks and one digit scan
+    # replaces the regex match for virtually every line in a healthy file.
+    if len(line) == 29 and line[12:17] == " --> ":
+        start = line[:12]
+        end = line[17:]
+        if (
+            start[2] == ":" and start[5] == ":" and start[8] == ","
+            and end[2] == ":" and end[5] == ":" and end[8] == ","
+            and (start + end).replace(":", "").replace(",", "").isdigit()
+        ):
+            return (
+                int(start[:2]) * 3600000 + int(start[3:5]) * 60000
+                + int(start[6:8]) * 1000 + int(start[9:]),
+                int(end[:2]) * 3600000 + int(end[3:5]) * 60000
+                + int(end[6:8]) * 1000 + int(end[9:]),
+            )
+    # Fallback: the regex tolerates odd spacing around the arrow
+    m = _match(line)
     if not m:
         return None
-    start = f"{m.group(1)}:{m.group(2)}:{m.group(3)},{m.group(4)}"
-    end = f"{m.group(5)}:{m.group(6)}:{m.group(7)},{m.group(8)}"
-    return start, end
+    h1, m1, s1, ms1, h2, m2, s2, ms2 = m.groups()
+    return (
+        int(h1) * 3600000 + int(m1) * 60000 + int(s1) * 1000 + int(ms1),
+        int(h2) * 3600000 + int(m2) * 60000 + int(s2) * 1000 + int(ms2),
+    )
+
+def format_timestamp(ms: int) -> str:
+    """Render integer milliseconds back to the SRT "HH:MM:SS,mmm" form"""
+    s, ms = divmod(ms, 1000)
+    h, s = divmod(s, 3600)
+    m, s = divmod(s, 60)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
 
 def parse_srt_file(text: str) -> List[SubtitleBlock]:
     """Parse SRT file content into subtitle blocks"""
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
-    lines = text.split("\n")
+    # splitlines() understands \r\n and bare \r natively, so the two
+    # whole-text replace() copies are gone. Stripped lines are computed once
+    # up front: almost every line gets inspected stripped two or three times
+    # (index test, timestamp test, next-block lookahead).
+    lines = text.splitlines()
+    stripped_lines = [line.strip() for line in lines]
+    n = len(lines)
     blocks = []
+    blocks_append = blocks.append
     i = 0
-    
-    while i < len(lines):
+
+    while i < n:
         # Skip empty lines
-        while i < len(lines) and not lines[i].strip():
+        while i < n and not stripped_lines[i]:
             i += 1
-        if i >= len(lines):
+        if i >= n:
             break
 
         line_number = i + 1
         index = None
-        current = lines[i].strip()
+        current = stripped_lines[i]
 
-        # Try to parse index
-        if current.isdigit():
+        # Try to parse index. One character decides whether to attempt it,
+        # and int() then does the only full scan of the line; the except
+        # branch rarely runs because a digit-led line at block start is
+        # almost always a bare index.
+        if current[:1].isdecimal():
             try:
                 index = int(current)
                 i += 1
-                if i >= len(lines):
+                if i >= n:
                     break
-                current = lines[i].strip()
+                current = stripped_lines[i]
             except ValueError:
-                pass
+                index = None
 
         # Parse timestamp
         ts = parse_timestamp_line(current)
@@ -101,26 +143,29 @@ def parse_srt_file(text: str) -> List[SubtitleBlock]:
 
         # Collect text lines
         text_lines = []
-        while i < len(lines):
-            line = lines[i]
-            stripped = line.strip()
+        while i < n:
+            stripped = stripped_lines[i]
             if not stripped:
                 break
-            if stripped.isdigit():
-                if i + 1 < len(lines) and parse_timestamp_line(lines[i + 1].strip()):
+            if stripped.isdecimal():
+                if i + 1 < n and parse_timestamp_line(stripped_lines[i + 1]):
                     break
             if parse_timestamp_line(stripped):
                 break
-            text_lines.append(line.rstrip())
+            text_lines.append(lines[i].rstrip())
             i += 1
 
-        blocks.append(
+        blocks_append(
             SubtitleBlock(
                 index=index,
                 start_time=start_time,
                 end_time=end_time,
                 text_lines=text_lines,
                 line_number=line_number,
+                # "line and not line.isspace()" matches line.strip() truthiness
+                # without allocating a stripped copy per line
+                has_text=any(line and not line.isspace() for line in text_lines),
+                text_preview=text_lines[0].strip()[:80] if text_lines else "",
             )
         )
 
@@ -200,7 +245,16 @@ def validate_subtitle_pair(
     # Fast validation: only check critical blocks
     error_count = 0
     checked_blocks = 0
-    
+    issues_append = issues.append
+
+    # One C-level list comparison tells us whether any timestamp differs at
+    # all. Error-free files — the overwhelmingly common case — then skip the
+    # per-block string comparisons entirely.
+    timestamps_equal = (
+        [(b.start_time, b.end_time) for b in en_blocks]
+        == [(b.start_time, b.end_time) for b in target_blocks]
+    )
+
     for i in range(len(en_blocks)):
         en_b = en_blocks[i]
         tg_b = target_blocks[i]
@@ -208,38 +262,54 @@ def validate_subtitle_pair(
         # Skip silent blocks
         if not en_b.has_text:
             continue
-        
+
         checked_blocks += 1
 
         # Quick timestamp check
-        if en_b.start_time != tg_b.start_time or en_b.end_time != tg_b.end_time:
-            issues.append(
-                ValidationIssue(
-                    issue_type="timestamp_mismatch",
-                    severity="error",
-                    block_index=i + 1,
-                    message=f"Timestamp mismatch at block {i + 1}",
-                    details={
-                        "en_start": en_b.start_time,
-                        "target_start": tg_b.start_time,
-                    },
-                )
-            )
+        if not timestamps_equal and (
+            en_b.start_time != tg_b.start_time or en_b.end_time != tg_b.end_time
+        ):
             error_count += 1
+            if len(issues) < MAX_ISSUES:
+                issues_append(
+                    ValidationIssue(
+                        issue_type="timestamp_mismatch",
+                        severity="error",
+                        block_index=i + 1,
+                        message=f"Timestamp mismatch at block {i + 1}",
+                        details={
+                            "en_start": format_timestamp(en_b.start_time),
+                            "target_start": format_timestamp(tg_b.start_time),
+                        },
+                    )
+                )
             continue
 
         # Quick check: does target have content?
         if not tg_b.has_text:
-            issues.append(
-                ValidationIssue(
-                    issue_type="missing_dialogue",
-                    severity="error",
-                    block_index=i + 1,
-                    message=f"Missing translation in block {i + 1}",
-                    details={"en_text": en_b.text_preview},
+            error_count += 1
+            if len(issues) < MAX_ISSUES:
+                issues_append(
+                    ValidationIssue(
+                        issue_type="missing_dialogue",
+                        severity="error",
+                        block_index=i + 1,
+                        message=f"Missing translation in block {i + 1}",
+                        details={"en_text": en_b.text_preview},
+                    )
                 )
+
+    # Errors past the cap were still counted (so match_rate stays accurate);
+    # flag the truncation for the frontend.
+    if error_count > MAX_ISSUES:
+        issues_append(
+            ValidationIssue(
+                issue_type="truncated",
+                severity="warning",
+                block_index=None,
+                message=f"Issue list truncated after {MAX_ISSUES} of {error_count} errors",
             )
-            error_count += 1
+        )
 
     # Calculate match rate only for checked blocks
     if checked_blocks > 0: